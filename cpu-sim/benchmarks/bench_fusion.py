@@ -0,0 +1,68 @@
+"""Throughput of the predecoded engine with and without superinstruction fusion.
+
+    python benchmarks/bench_fusion.py [--steps N]
+
+Idle-loop fast-forward is off for every run so that loops are actually
+executed and only fusion differs between the two predecoded columns.
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cpu.cpu_core import CPU                          # noqa: E402
+from cpu.engines import FUSIONS, PredecodedEngine     # noqa: E402
+from cpu.runner import load_image, run                # noqa: E402
+
+WORKLOADS = {
+    # 15 원소 배열 합을 무한 반복: load_const, ldr_add, add_br 가 모두 나온다
+    "array-sum": [
+        0x5020,   # x3000 AND R0, R0, #0
+        0x2208,   # x3001 LD  R1, #8      ; R1 = x4000
+        0x56E0,   # x3002 AND R3, R3, #0
+        0x16EF,   # x3003 ADD R3, R3, #15
+        0x6440,   # x3004 LDR R2, R1, #0
+        0x1002,   # x3005 ADD R0, R0, R2
+        0x1261,   # x3006 ADD R1, R1, #1
+        0x16FF,   # x3007 ADD R3, R3, #-1
+        0x03FB,   # x3008 BRp #-5
+        0x0FF6,   # x3009 BRnzp #-10
+        0x4000,
+    ],
+    # delay loop (ADD R1,R1,#-1 ; BRp) 를 무한 반복
+    "countdown": [
+        0x2203,   # x3000 LD  R1, #3      ; R1 = 1000
+        0x127F,   # x3001 ADD R1, R1, #-1
+        0x03FE,   # x3002 BRp #-2
+        0x0FFC,   # x3003 BRnzp #-4
+        1000,
+    ],
+}
+
+
+def measure(words, steps, engine):
+    cpu = CPU()
+    load_image(cpu, words, 0x3000)
+    for i in range(16):
+        cpu.mem.write(0x4000 + i, i)
+    return run(cpu, steps, engine=engine).stats
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    ap.add_argument("--steps", type=int, default=1_000_000)
+    args = ap.parse_args(argv)
+    print(f"{'workload':<11} {'reference':>11} {'unfused':>11} {'fused':>11} {'gain':>6}  fusions fired")
+    for name, words in WORKLOADS.items():
+        ref = measure(words, args.steps, "reference")
+        plain = measure(words, args.steps, PredecodedEngine(fast_forward=False, fuse=False))
+        fused = measure(words, args.steps, PredecodedEngine(fast_forward=False))
+        fired = ", ".join(f"{k}={fused['fused_' + k]}" for k in FUSIONS if fused["fused_" + k])
+        print(f"{name:<11} {ref['ips']:>11,.0f} {plain['ips']:>11,.0f} {fused['ips']:>11,.0f} "
+              f"{fused['ips'] / plain['ips']:>5.2f}x  {fired or '-'}")
+    print("(instructions per second)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,6 @@
+"""Headless LC-3 core. Importing this package never pulls in Qt."""
+from .cpu_core import CPU
+from .memory import Memory
+from .registers import Registers
+
+__all__ = ["CPU", "Memory", "Registers"]
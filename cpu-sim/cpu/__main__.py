@@ -0,0 +1,73 @@
+"""Non-GUI entry point: `python -m cpu program.obj [--steps N]`.
+
+Loads an LC-3 object file (or assembles a `.asm` source), runs it headless
+and prints the final registers. Runtime errors in assembled sources are
+reported as file:line."""
+import argparse
+import sys
+
+from .cpu_core import CPU
+from .registers import GENERAL_REGS
+from .engines import ENGINES
+from .runner import read_obj, load_image, run
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog="python -m cpu",
+                                 description="Run an LC-3 program without the GUI.")
+    ap.add_argument("program", help="LC-3 .obj file (big-endian, first word = origin) "
+                                    "or .asm source")
+    ap.add_argument("--origin", type=lambda s: int(s.lstrip("xX"), 16), default=0x3000,
+                    help="load address for .asm sources, hex (default: x3000)")
+    ap.add_argument("--steps", type=int, default=100_000,
+                    help="instruction budget (default: 100000)")
+    ap.add_argument("--input", default="",
+                    help="characters queued on the keyboard before running")
+    ap.add_argument("--engine", choices=sorted(ENGINES), default="reference",
+                    help="execution engine (default: reference)")
+    ap.add_argument("--cache", metavar="PATH",
+                    help="SQLite result cache; identical runs are not re-executed")
+    args = ap.parse_args(argv)
+
+    cpu = CPU()
+    try:
+        if args.program.lower().endswith(".asm"):
+            origin, words = args.origin, _assemble(cpu, args.program, args.origin)
+        else:
+            origin, words = read_obj(args.program)
+    except (OSError, ValueError) as e:
+        ap.error(str(e))
+    load_image(cpu, words, origin)
+    cache = None
+    if args.cache:
+        from .cache import ResultCache
+        cache = ResultCache(args.cache)
+    result = run(cpu, args.steps, args.input, args.engine, cache)
+    if result.output:
+        sys.stdout.write(result.output)
+        if not result.output.endswith("\n"):
+            sys.stdout.write("\n")
+
+    regs = " ".join(f"R{i}={cpu.reg[i]:04X}" for i in range(GENERAL_REGS))
+    print(f"{regs} PC={cpu.reg.pc:04X} PSR={cpu.reg.cpsr:04X}")
+    print(f"steps={result.steps} halted={result.halted} "
+          f"cache_hit={result.stats['cache_hit']}")
+    if result.error:
+        where = f"{result.location}: " if result.location else ""
+        print(f"{where}error: {result.error}", file=sys.stderr)
+        return 1
+    return 0
+
+
+def _assemble(cpu, path, origin):
+    from .assembler import assemble
+    with open(path, encoding="utf-8") as f:
+        asm = assemble(f.read(), origin, path)
+    if asm.errors:
+        raise ValueError(f"{path}: " + "; ".join(asm.errors))
+    cpu.source_map = asm.source_map
+    return asm.words
+
+
+if __name__ == "__main__":
+    sys.exit(main())
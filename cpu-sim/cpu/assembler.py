@@ -0,0 +1,211 @@
+"""Minimal LC-3 assembler (one instruction per line).
+
+Shared by the GUI's "Assemble and Load" button and headless tools such as
+coverage reports. A line may start with a label (`LOOP ADD R1, R1, #-1`, or
+`LOOP:` on a line of its own); PC-relative operands of BR, JSR, LD, LDI,
+ST, STI and LEA may name a label instead of a `#offset`."""
+import re
+
+from .sourcemap import SourceMap
+
+_MNEMONIC = re.compile(r'(ADD|AND|NOT|BR[nzp]{0,3}|JMP|RET|JSRR?|LDI?|LDR|STI?|STR|LEA|TRAP)$',
+                       re.I)
+_PC_RELATIVE = re.compile(r'(BR[nzp]{0,3}|JSR|LDI?|STI?|LEA)\b', re.I)
+_OPERAND_LABEL = re.compile(r'(.*[\s,])([A-Za-z_]\w*)$')
+
+
+class Assembly:
+    """Result of `assemble()`: the words written and where each source line went."""
+    __slots__ = ("origin", "words", "lines", "errors", "symbols", "source_map")
+
+    def __init__(self, origin, words, lines, errors, symbols=None, filename="<input>"):
+        self.origin = origin
+        self.words = words      # 16-bit words from `origin` onward
+        self.lines = lines      # [(line_no (1-based), address), ...] in source order
+        self.errors = errors    # ["Line n: message", ...]
+        self.symbols = symbols if symbols is not None else {}   # label -> address
+        self.source_map = SourceMap(lines, filename)            # address <-> line
+
+
+def split_label(line: str):
+    """`'LOOP: ADD ...'` / `'LOOP ADD ...'` → `('LOOP', 'ADD ...')`; no label → `(None, line)`.
+
+    Comments are removed. A label alone on a line needs the trailing colon."""
+    code = re.sub(r';.*$', '', line).strip()
+    m = re.match(r'([A-Za-z_]\w*)(:?)\s*(.*)$', code)
+    if m and (m.group(2) or (m.group(3) and not _MNEMONIC.match(m.group(1)))):
+        return m.group(1), m.group(3)
+    return None, code
+
+
+def _resolve(body: str, addr: int, symbols) -> str:
+    """Replace a label operand of a PC-relative instruction with `#offset`."""
+    m = _OPERAND_LABEL.match(body)
+    if not m or not _PC_RELATIVE.match(body) or re.fullmatch(r'R\d', m.group(2), re.I):
+        return body
+    name = m.group(2)
+    if symbols is None:                 # 1차 패스: 주소 계산만 (offset 은 아직 모름)
+        return m.group(1) + '#0'
+    if name not in symbols:
+        raise ValueError(f"undefined label {name}")
+    return f"{m.group(1)}#{symbols[name] - (addr + 1)}"
+
+
+def assemble(text: str, origin: int = 0, filename: str = "<input>") -> Assembly:
+    """Assemble `text` starting at `origin`. Bad lines are reported in `errors`.
+
+    `filename` only labels locations in the result's `source_map`."""
+    # 1차 패스: 라벨 주소. 명령은 모두 한 워드이고, 잘못된 줄은 주소를 차지하지 않는다
+    symbols, entries, errors = {}, [], []
+    addr = origin
+    for i, line in enumerate(text.split('\n')):
+        label, body = split_label(line)
+        if label is not None:
+            if label in symbols:
+                errors.append((i + 1, f"duplicate label {label}"))
+            else:
+                symbols[label] = addr
+        if not body:                    # Skip empty lines and comments
+            continue
+        try:
+            assemble_instruction(_resolve(body, addr, None))
+        except ValueError as e:
+            errors.append((i + 1, str(e)))
+            continue
+        entries.append((i + 1, body, addr))
+        addr += 1
+    # 2차 패스: 라벨 operand 를 offset 으로 바꿔 실제 어셈블
+    words, lines = [], []
+    for no, body, addr in entries:
+        try:
+            instr_words = assemble_instruction(_resolve(body, addr, symbols))
+        except ValueError as e:
+            # 1차 패스에서 이미 주소를 받은 줄: 빈 워드(x0000, NOP)로 자리를 채워
+            # 뒤따르는 줄의 주소·라벨·source map 이 words 와 어긋나지 않게 한다
+            errors.append((no, str(e)))
+            words.append(0)
+            continue
+        if addr + len(instr_words) > 0x10000:
+            errors.append((no, f"Memory overflow at address {addr}"))
+            break
+        lines.append((no, addr))
+        words.extend(instr_words)
+    errors.sort(key=lambda e: e[0])
+    return Assembly(origin, words, lines, [f"Line {no}: {msg}" for no, msg in errors],
+                    symbols, filename)
+
+
+def assemble_instruction(line: str):
+    """
+    단일 LC-3 어셈블리 라인을 16-bit 워드 리스트로 변환.
+    ▸ 라벨 파서는 생략하고, #imm / #off 숫자만 허용.
+    ▸ 모든 숫자는 10진 또는 0xHEX 인식.
+    ▸ 잘못된 형식이면 ValueError 발생.
+    """
+    # 코멘트 제거
+    line = re.sub(r';.*$', '', line).strip()
+    if not line:
+        raise ValueError("empty")
+
+    # 공통 유틸
+    def num(tok, bits, signed=True):
+        """토큰 → int, 범위 검사(+sign extend를 기계가 하므로 여기선 값만 확인)"""
+        base = 16 if tok.lower().startswith('0x') else 10
+        v = int(tok, base)
+        lo = -(1 << (bits-1)) if signed else 0
+        hi =  (1 << (bits-1)) - 1 if signed else (1 << bits) - 1
+        if not lo <= v <= hi:
+            raise ValueError(f"immediate {tok} out of range for {bits}-bit field")
+        return v & ((1 << bits) - 1)
+
+    # -------- ADD / AND (두 형식) ---------------------------------
+    m = re.match(r'(ADD|AND)\s+R(\d),\s*R(\d),\s*(R(\d)|#(-?\w+))$', line, re.I)
+    if m:
+        op, dr, sr1, last, sr2, imm = m.groups()
+        opcode = 0x1 if op.upper() == 'ADD' else 0x5
+        dr = int(dr); sr1 = int(sr1)
+        if sr2:                          # 레지스터 형식
+            sr2 = int(sr2)
+            instr = (opcode << 12) | (dr << 9) | (sr1 << 6) | sr2
+        else:                            # 즉시 형식
+            imm5 = num(imm, 5)
+            instr = (opcode << 12) | (dr << 9) | (sr1 << 6) | (1 << 5) | imm5
+        return [instr]
+
+    # -------- NOT --------------------------------------------------
+    m = re.match(r'NOT\s+R(\d),\s*R(\d)$', line, re.I)
+    if m:
+        dr, sr = map(int, m.groups())
+        instr = (0x9 << 12) | (dr << 9) | (sr << 6) | 0x3F
+        return [instr]
+
+    # -------- BR ---------------------------------------------------
+    m = re.match(r'BR([nNpPzZ]{0,3})\s+#(-?\w+)$', line)
+    if m:
+        cond, off = m.groups()
+        nzp = 0
+        nzp |= 0b100 if 'n' in cond.lower() else 0
+        nzp |= 0b010 if 'z' in cond.lower() else 0
+        nzp |= 0b001 if 'p' in cond.lower() else 0
+        if nzp == 0: nzp = 0b111                  # plain “BR”
+        off9 = num(off, 9)
+        instr = (0x0 << 12) | (nzp << 9) | off9
+        return [instr]
+
+    # -------- JMP / RET -------------------------------------------
+    if re.fullmatch(r'RET', line, re.I):
+        return [(0xC << 12) | (7 << 6)]
+    m = re.match(r'JMP\s+R(\d)$', line, re.I)
+    if m:
+        baser = int(m.group(1))
+        return [(0xC << 12) | (baser << 6)]
+
+    # -------- JSR / JSRR ------------------------------------------
+    m = re.match(r'JSRR\s+R(\d)$', line, re.I)
+    if m:
+        baser = int(m.group(1))
+        instr = (0x4 << 12) | (0 << 11) | (0 << 9) | (baser << 6)
+        return [instr]
+    m = re.match(r'JSR\s+#(-?\w+)$', line, re.I)
+    if m:
+        off11 = num(m.group(1), 11)
+        instr = (0x4 << 12) | (1 << 11) | off11
+        return [instr]
+
+    # -------- LD / LDI / ST / STI (PC-offset9) --------------------
+    for mnemonic, opc in [('LD',0x2), ('LDI',0xA), ('ST',0x3), ('STI',0xB)]:
+        m = re.match(fr'{mnemonic}\s+R?(\d),\s*#(-?\w+)$', line, re.I)
+        if m:
+            reg, off = m.groups()
+            reg = int(reg)
+            off9 = num(off, 9)
+            instr = (opc << 12) | (reg << 9) | off9
+            return [instr]
+
+    # -------- LDR / STR (Base+off6) -------------------------------
+    for mnemonic, opc in [('LDR',0x6), ('STR',0x7)]:
+        m = re.match(fr'{mnemonic}\s+R(\d),\s*R(\d),\s*#(-?\w+)$', line, re.I)
+        if m:
+            drsr, baser, off = m.groups()
+            drsr  = int(drsr)
+            baser = int(baser)
+            off6  = num(off, 6)
+            instr = (opc << 12) | (drsr << 9) | (baser << 6) | off6
+            return [instr]
+
+    # -------- LEA --------------------------------------------------
+    m = re.match(r'LEA\s+R(\d),\s*#(-?\w+)$', line, re.I)
+    if m:
+        dr, off = m.groups()
+        dr = int(dr); off9 = num(off, 9, signed=True)
+        instr = (0xE << 12) | (dr << 9) | off9
+        return [instr]
+
+    # -------- TRAP -------------------------------------------------
+    m = re.match(r'TRAP\s+x([0-9A-F]{1,2})$', line, re.I)
+    if m:
+        vect = int(m.group(1), 16) & 0xFF
+        instr = (0xF << 12) | vect
+        return [instr]
+
+    raise ValueError("syntax error or unsupported opcode")
@@ -0,0 +1,125 @@
+"""Content-addressed cache of deterministic program runs.
+
+A run is fully determined by the starting machine state, the keyboard input,
+the step budget and the engine, so its final state and output can be reused.
+The key is a SHA-256 over exactly those inputs; entries live in a local
+SQLite file, capped in size with least-recently-used eviction.
+
+    cache = ResultCache("runs.sqlite", max_bytes=64 << 20)
+    result = run(cpu, 100_000, inputs="abc", cache=cache)
+    result.stats["cache_hit"]
+"""
+import hashlib
+import json
+import sqlite3
+import struct
+import time
+import zlib
+from array import array
+
+from .devices import device_state as _device_state, restore_device_state as _restore_devices
+
+CACHE_FORMAT = 1     # 키/값 레이아웃이 바뀌면 올려서 이전 항목을 무효화
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    key       TEXT PRIMARY KEY,
+    meta      TEXT NOT NULL,
+    regs      BLOB NOT NULL,
+    mem       BLOB NOT NULL,
+    size      INTEGER NOT NULL,
+    last_used REAL NOT NULL
+)"""
+
+
+class ResultCache:
+    """SQLite-backed run cache with a byte-size cap and LRU eviction."""
+
+    def __init__(self, path, max_bytes: int = 256 << 20):
+        self.path = str(path)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.db = sqlite3.connect(self.path, timeout=30)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute(_SCHEMA)
+        self.db.commit()
+
+    def close(self) -> None:
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ─────────────────────────── key ─────────────────────────────────
+    @staticmethod
+    def key(cpu, inputs, max_steps: int, engine) -> str:
+        """Hash of (memory image, registers, devices, input, budget, engine version)."""
+        if isinstance(inputs, str):
+            inputs = inputs.encode("latin-1")
+        h = hashlib.sha256()
+        h.update(struct.pack("<HQ", CACHE_FORMAT, max_steps))
+        h.update(f"{engine.name}:{engine.version}".encode())
+        h.update(cpu.reg.file.tobytes())
+        h.update(json.dumps(_device_state(cpu)).encode())
+        h.update(struct.pack("<Q", len(inputs or b"")))
+        h.update(inputs or b"")
+        h.update(memoryview(cpu.mem.mem).cast("B"))
+        return h.hexdigest()
+
+    # ─────────────────────────── lookup / store ──────────────────────
+    def load(self, key: str, cpu):
+        """Restore the cached final state into `cpu`; returns the run metadata or None."""
+        row = self.db.execute("SELECT meta, regs, mem FROM results WHERE key = ?",
+                              (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        meta = json.loads(row[0])
+        regs = array("H")
+        regs.frombytes(row[1])
+        cpu.reg.load(regs)
+        memoryview(cpu.mem.mem).cast("B")[:] = zlib.decompress(row[2])
+        _restore_devices(cpu, meta["devices"])
+        cpu.running = meta["running"]
+        self.db.execute("UPDATE results SET last_used = ? WHERE key = ?",
+                        (time.time(), key))
+        self.db.commit()
+        self.hits += 1
+        return meta
+
+    def store(self, key: str, cpu, steps: int, error) -> None:
+        """Record the final state of `cpu` after a run of `steps` instructions."""
+        meta = json.dumps({"steps": steps, "error": error, "running": cpu.running,
+                           "devices": _device_state(cpu)})
+        regs = cpu.reg.file.tobytes()
+        mem = zlib.compress(memoryview(cpu.mem.mem).cast("B"), 1)
+        size = len(meta) + len(regs) + len(mem)
+        self.db.execute("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?)",
+                        (key, meta, regs, mem, size, time.time()))
+        self._evict()
+        self.db.commit()
+
+    def _evict(self) -> None:
+        total = self.db.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = self.db.execute("SELECT key, size FROM results ORDER BY last_used").fetchall()
+        doomed = []
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            doomed.append((key,))
+            total -= size
+        self.db.executemany("DELETE FROM results WHERE key = ?", doomed)
+
+    # ─────────────────────────── stats ───────────────────────────────
+    def __len__(self) -> int:
+        return self.db.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def size(self) -> int:
+        """Total stored bytes."""
+        return self.db.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
@@ -0,0 +1,133 @@
+"""Instruction and branch coverage as fixed-size bitmaps.
+
+One bit per address in each of three 8 KiB bitmaps (64K addresses / 8):
+
+    executed  : an instruction at this address was fetched and executed
+    taken     : a BR at this address branched
+    not_taken : a BR at this address fell through
+
+Bitmaps from any number of runs combine with bitwise OR (`|=`, `merged()`),
+so parallel workers can each write `to_bytes()` and be merged afterwards.
+"""
+BITMAP_BYTES = 0x10000 // 8
+
+
+def _or(a: bytearray, b) -> None:
+    a[:] = (int.from_bytes(a, "little") | int.from_bytes(b, "little")).to_bytes(
+        BITMAP_BYTES, "little")
+
+
+def _popcount(a) -> int:
+    return bin(int.from_bytes(a, "little")).count("1")
+
+
+class Coverage:
+    """Set `cpu.coverage = Coverage()` to collect; engines call `record()` per instruction."""
+    __slots__ = ("executed", "taken", "not_taken")
+
+    def __init__(self):
+        self.executed = bytearray(BITMAP_BYTES)
+        self.taken = bytearray(BITMAP_BYTES)
+        self.not_taken = bytearray(BITMAP_BYTES)
+
+    def record(self, addr: int, instr: int, psr: int) -> None:
+        """Mark `instr` at `addr` as executed; `psr` is the PSR *before* executing it."""
+        self.executed[addr >> 3] |= 1 << (addr & 7)
+        if not instr >> 12 and instr & 0x0E00:              # BR with any of n/z/p
+            bm = self.taken if psr & (instr >> 9) & 0x7 else self.not_taken
+            bm[addr >> 3] |= 1 << (addr & 7)
+
+    # ─────────────────────────── queries ─────────────────────────────
+    def covered(self, addr: int) -> bool:
+        return bool(self.executed[addr >> 3] >> (addr & 7) & 1)
+
+    def branch(self, addr: int) -> str:
+        """'both', 'taken', 'not-taken' or '' for a BR site."""
+        bit = 1 << (addr & 7)
+        t = self.taken[addr >> 3] & bit
+        n = self.not_taken[addr >> 3] & bit
+        return "both" if t and n else "taken" if t else "not-taken" if n else ""
+
+    def instructions(self) -> int:
+        """Number of distinct executed addresses."""
+        return _popcount(self.executed)
+
+    def branch_sites(self):
+        """`(BR sites seen, BR sites that went both ways)`."""
+        t = int.from_bytes(self.taken, "little")
+        n = int.from_bytes(self.not_taken, "little")
+        return bin(t | n).count("1"), bin(t & n).count("1")
+
+    # ─────────────────────────── merge / storage ─────────────────────
+    def __ior__(self, other: "Coverage") -> "Coverage":
+        _or(self.executed, other.executed)
+        _or(self.taken, other.taken)
+        _or(self.not_taken, other.not_taken)
+        return self
+
+    @classmethod
+    def merged(cls, coverages) -> "Coverage":
+        """OR together Coverage objects or `to_bytes()` blobs."""
+        out = cls()
+        ex = tk = nt = 0
+        for c in coverages:
+            if not isinstance(c, Coverage):
+                c = cls.from_bytes(c)
+            ex |= int.from_bytes(c.executed, "little")
+            tk |= int.from_bytes(c.taken, "little")
+            nt |= int.from_bytes(c.not_taken, "little")
+        out.executed[:] = ex.to_bytes(BITMAP_BYTES, "little")
+        out.taken[:] = tk.to_bytes(BITMAP_BYTES, "little")
+        out.not_taken[:] = nt.to_bytes(BITMAP_BYTES, "little")
+        return out
+
+    def to_bytes(self) -> bytes:
+        return bytes(self.executed + self.taken + self.not_taken)
+
+    @classmethod
+    def from_bytes(cls, data) -> "Coverage":
+        if len(data) != 3 * BITMAP_BYTES:
+            raise ValueError(f"coverage blob must be {3 * BITMAP_BYTES} bytes, got {len(data)}")
+        cov = cls()
+        cov.executed[:] = data[:BITMAP_BYTES]
+        cov.taken[:] = data[BITMAP_BYTES:2 * BITMAP_BYTES]
+        cov.not_taken[:] = data[2 * BITMAP_BYTES:]
+        return cov
+
+    def save(self, path) -> None:
+        with open(path, "wb") as f:
+            f.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path) -> "Coverage":
+        with open(path, "rb") as f:
+            return cls.from_bytes(f.read())
+
+
+def coverage_report(cov: Coverage, source: str, assembly) -> str:
+    """Overlay coverage onto assembler source lines.
+
+    `assembly` is the `cpu.assembler.Assembly` produced from `source`. Each
+    instruction line is prefixed with its address and `+` (executed) or
+    `-` (never executed); BR lines also show which directions were seen."""
+    where = dict(assembly.lines)
+    out = []
+    hit = total = branches = both = 0
+    for no, text in enumerate(source.split("\n"), 1):
+        addr = where.get(no)
+        if addr is None:
+            out.append(f"{'':18}{text}")
+            continue
+        total += 1
+        mark = "+" if cov.covered(addr) else "-"
+        hit += mark == "+"
+        word = assembly.words[addr - assembly.origin]
+        br = ""
+        if not word >> 12 and word & 0x0E00:
+            branches += 1
+            br = cov.branch(addr) or "never"
+            both += br == "both"
+        out.append(f"x{addr:04X} {mark} {br:<9} {text}")
+    out.append(f"{hit}/{total} instructions executed, "
+               f"{both}/{branches} branches taken both ways")
+    return "\n".join(out)
@@ -1,5 +1,7 @@
 from .registers import Registers
 from .memory import Memory
+from .interrupts import InterruptController, INT_VECTOR_TABLE
+from .devices import attach_console
 
 class CPU:
     """
@@ -7,14 +9,19 @@ class CPU:
     ─────────────────────────────────────────────────────
     • fetch()  : 메모리에서 16-bit 명령어 읽고 PC++
     • decode_execute(): opcode 해석 → 각 명령 수행
-    • step()   : 한 사이클 실행 (fetch → decode/exec)
+    • step()   : 한 사이클 실행 (인터럽트 확인 → fetch → decode/exec)
     • reset()  : 레지스터/메모리 초기화
     """
 
     def __init__(self):
         self.reg = Registers()   # R0..R7, PC, CPSR, SSP/USP 등
         self.mem = Memory()      # 64 KiB 메모리 + MMIO hook
+        self.intc = InterruptController()
+        attach_console(self)     # keyboard / display / MCR (xFE00–xFFFE)
+        self.reg.saved_ssp = 0x3000   # 슈퍼바이저 스택: x3000 아래로 성장
         self.running = False
+        self.coverage = None     # cpu.coverage.Coverage 를 넣으면 실행/분기 비트맵 수집
+        self.source_map = None   # cpu.sourcemap.SourceMap: 오류 위치를 file:line 으로 표시
 
     # ───────────────────────────── fetch ─────────────────────────────
     def fetch(self):
@@ -39,10 +46,39 @@ class CPU:
         elif value == 0:     self.reg.cpsr |= 0x2   # Z
         else:                self.reg.cpsr |= 0x1   # P
 
+    # ──────────────────── supervisor entry / interrupts ──────────────
+    def push_context(self, old_psr: int):
+        """User→Supervisor 스택 전환 후 PSR, PC 를 슈퍼바이저 스택에 push"""
+        r = self.reg.file
+        if (old_psr >> 15) & 1:
+            self.reg.saved_usp = r[6]
+            r[6]               = self.reg.saved_ssp
+        # PSR, PC push (PSR 먼저)
+        r[6] = (r[6] - 1) & 0xFFFF
+        self.mem.write(r[6], old_psr)
+        r[6] = (r[6] - 1) & 0xFFFF
+        self.mem.write(r[6], self.reg.pc)
+
+    def check_interrupt(self) -> bool:
+        """
+        대기 중인 요청 중 PSR[10:8] 보다 우선순위가 높은 것이 있으면 진입.
+        PSR ← Supervisor | PL(요청) (CC 클리어), PC ← M[x0100 + vector]
+        """
+        old_psr = self.reg.cpsr
+        req = self.intc.highest((old_psr >> 8) & 0x7)
+        if req is None:
+            return False
+        vector, priority = req
+        self.push_context(old_psr)
+        self.reg.cpsr = priority << 8
+        self.reg.pc = self.mem.read(INT_VECTOR_TABLE + vector)
+        return True
+
     # ───────────────────────── decode / execute ──────────────────────
     def decode_execute(self):
         instr = self.reg.ir
         op = (instr >> 12) & 0xF               # bits[15:12]
+        r = self.reg.file                      # R0..R7 fast path (검사 없음, 값은 마스크 완료)
 
         # ───────────── ADD (0001) ─────────────
         if op == 0b0001:
@@ -50,11 +86,11 @@ class CPU:
             rs1 = (instr >> 6) & 0x7
             if (instr >> 5) & 1:               # imm5 사용
                 imm5 = self.sext(instr & 0x1F, 5)
-                result = (self.reg[rs1] + imm5) & 0xFFFF
+                result = (r[rs1] + imm5) & 0xFFFF
             else:                              # 레지스터-레지스터
                 rs2 = instr & 0x7
-                result = (self.reg[rs1] + self.reg[rs2]) & 0xFFFF
-            self.reg[rd] = result
+                result = (r[rs1] + r[rs2]) & 0xFFFF
+            r[rd] = result
             self.setcc(result)
 
         # ───────────── AND (0101) ─────────────
@@ -63,12 +99,12 @@ class CPU:
             rs1 = (instr >> 6) & 0x7
             if (instr >> 5) & 1:
                 imm5 = self.sext(instr & 0x1F, 5)
-                result = self.reg[rs1] & imm5
+                result = r[rs1] & imm5
             else:
                 rs2 = instr & 0x7
-                result = self.reg[rs1] & self.reg[rs2]
+                result = r[rs1] & r[rs2]
             result &= 0xFFFF
-            self.reg[rd] = result
+            r[rd] = result
             self.setcc(result)
 
         # ───────────── BR (0000) ──────────────
@@ -85,17 +121,17 @@ class CPU:
         # ───────────── JMP / RET (1100) ───────
         elif op == 0b1100:
             baser = (instr >> 6) & 0x7          # BaseR or R7(RET)
-            self.reg.pc = self.reg[baser]
+            self.reg.pc = r[baser]
 
         # ───────────── JSR / JSRR (0100) ──────
         elif op == 0b0100:
-            self.reg[7] = self.reg.pc           # 링크(증가된 PC)
+            r[7] = self.reg.pc                  # 링크(증가된 PC)
             if (instr >> 11) & 1:               # JSR (PC+off11)
                 off11 = self.sext(instr & 0x7FF, 11)
                 self.reg.pc = (self.reg.pc + off11) & 0xFFFF
             else:                              # JSRR (BaseR)
                 baser = (instr >> 6) & 0x7
-                self.reg.pc = self.reg[baser]
+                self.reg.pc = r[baser]
 
         # ───────────── LD (0010) ──────────────
         elif op == 0b0010:
@@ -103,7 +139,7 @@ class CPU:
             off9 = self.sext(instr & 0x1FF, 9)
             addr = (self.reg.pc + off9) & 0xFFFF
             val  = self.mem.read(addr)
-            self.reg[dr] = val
+            r[dr] = val
             self.setcc(val)
 
         # ───────────── LDI (1010) ─────────────
@@ -112,7 +148,7 @@ class CPU:
             off9 = self.sext(instr & 0x1FF, 9)
             ptr  = self.mem.read((self.reg.pc + off9) & 0xFFFF)
             val  = self.mem.read(ptr & 0xFFFF)
-            self.reg[dr] = val
+            r[dr] = val
             self.setcc(val)
 
         # ───────────── LDR (0110) ─────────────
@@ -120,9 +156,9 @@ class CPU:
             dr   = (instr >> 9) & 0x7
             baser= (instr >> 6) & 0x7
             off6 = self.sext(instr & 0x3F, 6)
-            addr = (self.reg[baser] + off6) & 0xFFFF
+            addr = (r[baser] + off6) & 0xFFFF
             val  = self.mem.read(addr)
-            self.reg[dr] = val
+            r[dr] = val
             self.setcc(val)
 
         # ───────────── LEA (1110) ─────────────
@@ -130,15 +166,15 @@ class CPU:
             dr   = (instr >> 9) & 0x7
             off9 = self.sext(instr & 0x1FF, 9)
             addr = (self.reg.pc + off9) & 0xFFFF
-            self.reg[dr] = addr
+            r[dr] = addr
             self.setcc(addr)
 
         # ───────────── NOT (1001) ─────────────
         elif op == 0b1001:
             dr = (instr >> 9) & 0x7
             sr = (instr >> 6) & 0x7
-            val = (~self.reg[sr]) & 0xFFFF
-            self.reg[dr] = val
+            val = (~r[sr]) & 0xFFFF
+            r[dr] = val
             self.setcc(val)
 
         # ───────────── ST (0011) ──────────────
@@ -146,49 +182,40 @@ class CPU:
             sr   = (instr >> 9) & 0x7
             off9 = self.sext(instr & 0x1FF, 9)
             addr = (self.reg.pc + off9) & 0xFFFF
-            self.mem.write(addr, self.reg[sr])
+            self.mem.write(addr, r[sr])
 
         # ───────────── STI (1011) ─────────────
         elif op == 0b1011:
             sr   = (instr >> 9) & 0x7
             off9 = self.sext(instr & 0x1FF, 9)
             ptr  = self.mem.read((self.reg.pc + off9) & 0xFFFF)
-            self.mem.write(ptr & 0xFFFF, self.reg[sr])
+            self.mem.write(ptr & 0xFFFF, r[sr])
 
         # ───────────── STR (0111) ─────────────
         elif op == 0b0111:
             sr   = (instr >> 9) & 0x7
             baser= (instr >> 6) & 0x7
             off6 = self.sext(instr & 0x3F, 6)
-            self.mem.write((self.reg[baser] + off6) & 0xFFFF,
-                           self.reg[sr])
+            self.mem.write((r[baser] + off6) & 0xFFFF, r[sr])
 
         # ───────────── RTI (1000) ─────────────
         elif op == 0b1000:
             if (self.reg.cpsr >> 15) & 1:
                 raise RuntimeError("RTI in user mode")
             # PC ← pop, PSR ← pop
-            sp = self.reg[6]; new_pc = self.mem.read(sp); self.reg[6]=(sp+1)&0xFFFF
-            sp = self.reg[6]; new_psr= self.mem.read(sp); self.reg[6]=(sp+1)&0xFFFF
+            sp = r[6]; new_pc = self.mem.read(sp); r[6] = (sp+1)&0xFFFF
+            sp = r[6]; new_psr= self.mem.read(sp); r[6] = (sp+1)&0xFFFF
             self.reg.pc, self.reg.cpsr = new_pc, new_psr
             # User-mode 복귀 시 스택 포인터 교체
             if (new_psr >> 15) & 1:
-                self.reg.saved_ssp = self.reg[6]
-                self.reg[6]        = self.reg.saved_usp
+                self.reg.saved_ssp = r[6]
+                r[6]        = self.reg.saved_usp
 
         # ───────────── TRAP (1111) ────────────
         elif op == 0b1111:
             trapvect8 = instr & 0xFF
-            old_psr = self.reg.cpsr
-            # User → Supervisor 스택 전환
-            if (old_psr >> 15) & 1:
-                self.reg.saved_usp = self.reg[6]
-                self.reg[6]        = self.reg.saved_ssp
-            # PSR, PC push (PSR 먼저)
-            self.reg[6] = (self.reg[6] - 1) & 0xFFFF
-            self.mem.write(self.reg[6], old_psr)
-            self.reg[6] = (self.reg[6] - 1) & 0xFFFF
-            self.mem.write(self.reg[6], self.reg.pc)
+            # User → Supervisor 스택 전환 + PSR, PC push
+            self.push_context(self.reg.cpsr)
             # Supervisor 모드 진입
             self.reg.cpsr &= ~(1 << 15)
             # Trap vector 테이블 진입
@@ -205,9 +232,26 @@ class CPU:
     # ───────────────────────────── runner ─────────────────────────────
     def step(self):
         """한 명령어 사이클(fetch-decode-exec) 실행"""
+        if self.intc.pending:               # 장치 polling 없이 플래그 하나만 확인
+            self.check_interrupt()
         self.fetch()
+        if self.coverage is not None:
+            self.coverage.record((self.reg.pc - 1) & 0xFFFF, self.reg.ir, self.reg.cpsr)
         self.decode_execute()
 
     def reset(self):
-        """CPU/레지스터/메모리를 초기 상태로 되돌림"""
+        """CPU/레지스터/메모리를 초기 상태로 되돌림 (연결된 coverage 는 유지)"""
+        coverage = self.coverage
         self.__init__()
+        self.coverage = coverage
+
+    # ───────────────────────────── save state ────────────────────────
+    def save_state(self, path, compress: bool = True, sparse=None) -> int:
+        """레지스터/메모리/장치 상태를 파일로 저장 (형식: cpu.savestate). 파일 크기 반환"""
+        from .savestate import save_state
+        return save_state(self, path, compress, sparse)
+
+    def load_state(self, path):
+        """save_state() 로 저장한 상태를 복원. 잘못된 파일이면 ValueError"""
+        from .savestate import load_state
+        load_state(self, path)
@@ -0,0 +1,149 @@
+"""Memory-mapped LC-3 console devices and the machine control register.
+
+Each device owns its status/data registers and talks to the interrupt
+controller directly when its ready/IE state changes, so nothing has to be
+polled per instruction."""
+from .interrupts import KBD_VECTOR, DISPLAY_VECTOR, DEVICE_PRIORITY
+
+KBSR = 0xFE00   # keyboard status  [15]=ready [14]=IE
+KBDR = 0xFE02   # keyboard data
+DSR  = 0xFE04   # display status   [15]=ready [14]=IE
+DDR  = 0xFE06   # display data
+MCR  = 0xFFFE   # machine control  [15]=clock enable
+
+READY = 0x8000
+IE    = 0x4000
+
+
+class Keyboard:
+    """Input device fed from a character stream (GUI, runner, service)."""
+
+    def __init__(self, intc):
+        self.intc = intc
+        self.buffer = bytearray()   # 아직 래치되지 않은 입력
+        self.data = 0               # KBDR
+        self.ready = False          # KBSR[15]
+        self.ie = False             # KBSR[14]
+
+    def feed(self, data) -> None:
+        """Queue characters (`str` or bytes) for the program to read."""
+        self.buffer += data.encode("latin-1") if isinstance(data, str) else data
+        if not self.ready:
+            self._latch()
+
+    def _latch(self) -> None:
+        if self.buffer:
+            self.data = self.buffer.pop(0)
+            self.ready = True
+        self._update_irq()
+
+    def _update_irq(self) -> None:
+        if self.ready and self.ie:
+            self.intc.request(KBD_VECTOR, DEVICE_PRIORITY)
+        else:
+            self.intc.withdraw(KBD_VECTOR)
+
+    # MMIO handlers
+    def read_status(self) -> int:
+        return (READY if self.ready else 0) | (IE if self.ie else 0)
+
+    def write_status(self, value: int) -> None:
+        self.ie = bool(value & IE)          # ready 비트는 읽기 전용
+        self._update_irq()
+
+    def peek_data(self) -> int:
+        """KBDR without acknowledging it (for debuggers / memory views)."""
+        return self.data
+
+    def read_data(self) -> int:
+        value = self.data
+        self.ready = False
+        self._latch()                       # 다음 문자가 있으면 바로 래치
+        return value
+
+    def write_data(self, value: int) -> None:
+        pass
+
+
+class Display:
+    """Output device: always ready, collects written characters."""
+
+    def __init__(self, intc):
+        self.intc = intc
+        self.output = bytearray()
+        self.ie = False
+        self.on_output = None       # optional callback(int) per character
+
+    def read_status(self) -> int:
+        return READY | (IE if self.ie else 0)
+
+    def write_status(self, value: int) -> None:
+        self.ie = bool(value & IE)
+        if self.ie:
+            self.intc.request(DISPLAY_VECTOR, DEVICE_PRIORITY)
+        else:
+            self.intc.withdraw(DISPLAY_VECTOR)
+
+    def read_data(self) -> int:
+        return 0
+
+    def write_data(self, value: int) -> None:
+        ch = value & 0xFF
+        self.output.append(ch)
+        if self.on_output is not None:
+            self.on_output(ch)
+
+    def text(self) -> str:
+        return self.output.decode("latin-1")
+
+
+class MachineControl:
+    """MCR: clearing bit 15 stops the clock (HALT)."""
+
+    def __init__(self, cpu):
+        self.cpu = cpu
+        self.value = READY
+
+    def read(self) -> int:
+        return self.value
+
+    def write(self, value: int) -> None:
+        self.value = value
+        if not value & READY:
+            self.cpu.running = False
+
+
+def attach_console(cpu) -> None:
+    """Create keyboard, display and MCR for `cpu` and map them into memory."""
+    cpu.keyboard = Keyboard(cpu.intc)
+    cpu.display = Display(cpu.intc)
+    cpu.mcr = MachineControl(cpu)
+    mem = cpu.mem
+    kb, disp, mcr = cpu.keyboard, cpu.display, cpu.mcr
+    # 상태 레지스터 read 는 부작용이 없으므로 그대로 peek 으로 쓴다
+    mem.map_io(KBSR, kb.read_status, kb.write_status, kb.read_status)
+    mem.map_io(KBDR, kb.read_data, kb.write_data, kb.peek_data)
+    mem.map_io(DSR, disp.read_status, disp.write_status, disp.read_status)
+    mem.map_io(DDR, disp.read_data, disp.write_data, disp.read_data)
+    mem.map_io(MCR, mcr.read, mcr.write, mcr.read)
+
+
+def device_state(cpu) -> list:
+    """JSON-serialisable snapshot of the console devices and pending interrupts."""
+    kb, disp = cpu.keyboard, cpu.display
+    return [kb.buffer.hex(), kb.data, kb.ready, kb.ie,
+            disp.output.hex(), disp.ie, cpu.mcr.value,
+            sorted(cpu.intc._lines.items())]
+
+
+def restore_device_state(cpu, state) -> None:
+    """Inverse of `device_state()`."""
+    kb, disp = cpu.keyboard, cpu.display
+    kb.buffer = bytearray.fromhex(state[0])
+    kb.data, kb.ready, kb.ie = state[1], state[2], state[3]
+    disp.output = bytearray.fromhex(state[4])
+    disp.ie = state[5]
+    cpu.mcr.value = state[6]
+    cpu.intc.clear()
+    for vector, prio in state[7]:
+        cpu.intc.request(vector, prio)
@@ -0,0 +1,410 @@
+"""Execution engines: interchangeable ways of running the same CPU state.
+
+Every engine implements `run(cpu, max_steps) -> (steps, error)` and must
+leave exactly the architectural state that `CPU.step()` (the reference
+interpreter) would after the same number of instructions. `error` is the
+message of the `RuntimeError` that stopped execution, or None.
+
+    reference  : CPU.step() in a loop (fetch → decode_execute)
+    predecoded : per-address cache of decoded closures over `reg.file`
+"""
+from .idle import IdleLoopDetector
+from .memory import MEM_SIZE, MMIO_BASE
+from .registers import PC, IR, PSR, CC
+
+
+def _sext(val: int, bits: int) -> int:
+    sign = 1 << (bits - 1)
+    return (val & (sign - 1)) - (val & sign)
+
+
+class ReferenceEngine:
+    """The original interpreter, unchanged: one `CPU.step()` per instruction."""
+    name = "reference"
+    version = 1
+
+    def run(self, cpu, max_steps: int):
+        step = cpu.step
+        steps = 0
+        try:
+            while steps < max_steps and cpu.running:
+                step()
+                steps += 1
+        except RuntimeError as e:
+            return steps, str(e)
+        return steps, None
+
+
+class PredecodedEngine:
+    """
+    명령어 워드를 한 번만 해석해 주소별 closure 로 캐시하는 엔진.
+    ─────────────────────────────────────────────────────
+    • 캐시 항목은 (워드, handler). fetch 때 워드가 바뀌었으면 다시 해석하므로
+      self-modifying code, GUI 편집, 상태 로드에도 그대로 정확하다.
+    • handler 는 `reg.file` 과 `mem.mem` 을 직접 다룬다 (unchecked fast path).
+      I/O 페이지(xFE00–)만 Memory.read/write 를 거친다.
+    • TRAP / RTI / illegal opcode 는 CPU.decode_execute 에 위임.
+    • 뒤로 가는 BR 이 taken 되면 IdleLoopDetector 가 delay loop / busy-wait 를
+      건너뛴다 (`fast_forward=False` 로 끔). 건너뛴 명령도 steps 에 포함된다.
+    • 자주 나오는 명령 쌍은 superinstruction 하나로 합쳐 실행한다 (`fuse=False`
+      로 끔). 키는 첫 번째 명령의 주소이므로 쌍 중간으로 점프하면 두 번째
+      명령의 일반 handler 가 그대로 쓰인다. 커버리지 수집 중에는 쓰지 않는다.
+    """
+    name = "predecoded"
+    version = 3
+
+    def __init__(self, fast_forward: bool = True, idle_wait=None, fuse: bool = True):
+        self._bound = None      # (reg.file, mem.mem) the cache was built for
+        self._words = None      # 주소별 캐시된 워드 (-1 = 비어 있음)
+        self._handlers = None
+        self._back = None       # 주소별: 뒤로 가는 조건 BR 이면 1
+        self._fused = None      # 주소별 fused handler (pc, pc+1 쌍) 또는 None
+        self._filled = []       # 캐시가 채워진 주소 (다른 CPU 로 옮길 때 이것만 비운다)
+        self.idle = IdleLoopDetector(idle_wait) if fast_forward else None
+        self.fuse = fuse
+        self.fired = [0] * len(FUSIONS)     # fusion 종류별 실행 횟수
+
+    @property
+    def counters(self) -> dict:
+        idle = self.idle
+        out = {"idle_loops": idle.loops if idle else 0,
+               "idle_skipped": idle.skipped if idle else 0}
+        out.update(("fused_" + name, n) for name, n in zip(FUSIONS, self.fired))
+        return out
+
+    def _bind(self, cpu):
+        f, m = cpu.reg.file, cpu.mem.mem
+        b = self._bound
+        if b is None or b[0] is not f or b[1] is not m:
+            self._bound = (f, m)
+            if b is None:
+                self._words = [-1] * MEM_SIZE
+                self._handlers = [None] * MEM_SIZE
+                self._back = bytearray(MEM_SIZE)
+                self._fused = [None] * MEM_SIZE
+            else:
+                # 워드를 -1 로 되돌리면 나머지 테이블은 다음 fetch 때 다시 채워진다
+                words = self._words
+                for addr in self._filled:
+                    words[addr] = -1
+            self._filled.clear()
+        return self._words, self._handlers, self._back, self._fused
+
+    def run(self, cpu, max_steps: int):
+        words, handlers, back, fused = self._bind(cpu)
+        f = cpu.reg.file
+        m = cpu.mem.mem
+        read = cpu.mem.read
+        intc = cpu.intc
+        decode = self.decode
+        record = cpu.coverage.record if cpu.coverage is not None else None
+        fuse = self.fuse and record is None         # 커버리지는 명령 단위로 기록
+        pair = self.fuse_pair
+        idle = self.idle
+        if idle is not None:
+            idle.reset()
+        steps = 0
+        try:
+            while steps < max_steps and cpu.running:
+                if intc.pending:
+                    cpu.check_interrupt()
+                pc = f[PC]
+                w = m[pc] if pc < MMIO_BASE else read(pc)
+                if words[pc] != w:
+                    handlers[pc] = decode(cpu, w)
+                    if words[pc] < 0:
+                        self._filled.append(pc)
+                    words[pc] = w
+                    back[pc] = idle is not None and _is_back_branch(w)
+                    if self.fuse:
+                        fused[pc] = pair(cpu, pc, w, m[pc + 1]) if pc + 1 < MMIO_BASE else None
+                if fuse:
+                    h = fused[pc]
+                    if h is not None and max_steps - steps > 1 and h():
+                        steps += 2
+                        if f[PC] <= pc + 1 and idle is not None:    # ADD ; BR 뒤로
+                            steps += idle.skip(cpu, pc + 1, steps, max_steps - steps)
+                        continue
+                f[IR] = w
+                f[PC] = (pc + 1) & 0xFFFF
+                if record is not None:
+                    record(pc, w, f[PSR])
+                handlers[pc]()
+                steps += 1
+                if back[pc] and f[PC] <= pc:            # 뒤로 taken: idle loop 후보
+                    steps += idle.skip(cpu, pc, steps, max_steps - steps)
+        except RuntimeError as e:
+            return steps, str(e)
+        return steps, None
+
+    # ─────────────────────────── decoder ─────────────────────────────
+    @staticmethod
+    def decode(cpu, instr: int):
+        """Return a zero-argument closure executing `instr` (PC already incremented)."""
+        f = cpu.reg.file
+        m = cpu.mem.mem
+        read, write = cpu.mem.read, cpu.mem.write
+        op = instr >> 12
+        d = (instr >> 9) & 0x7
+        s = (instr >> 6) & 0x7
+
+        if op == 0b0001 or op == 0b0101:                # ADD / AND
+            if (instr >> 5) & 1:
+                imm = _sext(instr & 0x1F, 5) & 0xFFFF
+                if op == 0b0001:
+                    def h():
+                        v = (f[s] + imm) & 0xFFFF
+                        f[d] = v
+                        f[PSR] = (f[PSR] & 0xFFF8) | CC[v]
+                else:
+                    def h():
+                        v = f[s] & imm
+                        f[d] = v
+                        f[PSR] = (f[PSR] & 0xFFF8) | CC[v]
+            else:
+                t = instr & 0x7
+                if op == 0b0001:
+                    def h():
+                        v = (f[s] + f[t]) & 0xFFFF
+                        f[d] = v
+                        f[PSR] = (f[PSR] & 0xFFF8) | CC[v]
+                else:
+                    def h():
+                        v = f[s] & f[t]
+                        f[d] = v
+                        f[PSR] = (f[PSR] & 0xFFF8) | CC[v]
+            return h
+
+        if op == 0b0000:                                # BR
+            nzp = (instr >> 9) & 0x7
+            off = _sext(instr & 0x1FF, 9)
+            if not nzp:
+                return _nop
+
+            def h():
+                if f[PSR] & nzp:
+                    f[PC] = (f[PC] + off) & 0xFFFF
+            return h
+
+        if op == 0b1100:                                # JMP / RET
+            def h():
+                f[PC] = f[s]
+            return h
+
+        if op == 0b0100:                                # JSR / JSRR
+            if (instr >> 11) & 1:
+                off = _sext(instr & 0x7FF, 11)
+
+                def h():
+                    t = f[PC]
+                    f[7] = t
+                    f[PC] = (t + off) & 0xFFFF
+            else:
+                def h():                                # R7 먼저 (reference 와 동일)
+                    f[7] = f[PC]
+                    f[PC] = f[s]
+            return h
+
+        if op in (0b0010, 0b1010, 0b1110, 0b0011, 0b1011):   # PC-relative
+            off = _sext(instr & 0x1FF, 9)
+            if op == 0b0010:                            # LD
+                def h():
+                    a = (f[PC] + off) & 0xFFFF
+                    v = m[a] if a < MMIO_BASE else read(a)
+                    f[d] = v
+                    f[PSR] = (f[PSR] & 0xFFF8) | CC[v]
+            elif op == 0b1010:                          # LDI
+                def h():
+                    a = (f[PC] + off) & 0xFFFF
+                    a = m[a] if a < MMIO_BASE else read(a)
+                    v = m[a] if a < MMIO_BASE else read(a)
+                    f[d] = v
+                    f[PSR] = (f[PSR] & 0xFFF8) | CC[v]
+            elif op == 0b1110:                          # LEA
+                def h():
+                    v = (f[PC] + off) & 0xFFFF
+                    f[d] = v
+                    f[PSR] = (f[PSR] & 0xFFF8) | CC[v]
+            elif op == 0b0011:                          # ST
+                def h():
+                    a = (f[PC] + off) & 0xFFFF
+                    if a < MMIO_BASE:
+                        m[a] = f[d]
+                    else:
+                        write(a, f[d])
+            else:                                       # STI
+                def h():
+                    a = (f[PC] + off) & 0xFFFF
+                    a = m[a] if a < MMIO_BASE else read(a)
+                    if a < MMIO_BASE:
+                        m[a] = f[d]
+                    else:
+                        write(a, f[d])
+            return h
+
+        if op == 0b0110 or op == 0b0111:                # LDR / STR
+            off = _sext(instr & 0x3F, 6)
+            if op == 0b0110:
+                def h():
+                    a = (f[s] + off) & 0xFFFF
+                    v = m[a] if a < MMIO_BASE else read(a)
+                    f[d] = v
+                    f[PSR] = (f[PSR] & 0xFFF8) | CC[v]
+            else:
+                def h():
+                    a = (f[s] + off) & 0xFFFF
+                    if a < MMIO_BASE:
+                        m[a] = f[d]
+                    else:
+                        write(a, f[d])
+            return h
+
+        if op == 0b1001:                                # NOT
+            def h():
+                v = f[s] ^ 0xFFFF
+                f[d] = v
+                f[PSR] = (f[PSR] & 0xFFF8) | CC[v]
+            return h
+
+        # RTI / TRAP / illegal: 드물고 상태 전이가 복잡하므로 reference 에 위임
+        return cpu.decode_execute
+
+
+    # ─────────────────────────── fusion ──────────────────────────────
+    def fuse_pair(self, cpu, pc: int, w: int, w2: int):
+        """Return a closure executing `w` at `pc` and `w2` at `pc+1` together, or None.
+
+        The closure returns False without touching any state when it cannot
+        run exactly (the second word changed, or a load hits the I/O page,
+        whose side effects could raise an interrupt between the two); the
+        caller then executes `w` on its own. `cpu.setcc` semantics are kept
+        by using the same CC table as the single handlers."""
+        op, op2 = w >> 12, w2 >> 12
+        if op == 0b0001 and (w >> 5) & 1:
+            if op2 == 0b0000 and w2 & 0x0E00:
+                return self._add_br(cpu, pc, w, w2)
+        elif op == 0b0110:
+            if op2 == 0b0001:
+                return self._ldr_add(cpu, pc, w, w2)
+        elif op == 0b0101 and (w >> 5) & 1 and not w & 0x1F:
+            if op2 == 0b0001 and (w2 >> 5) & 1 and (w2 >> 6) & 0x7 == (w >> 9) & 0x7:
+                return self._load_const(cpu, pc, w, w2)
+        return None
+
+    def _add_br(self, cpu, pc, w, w2):
+        """ADD Rd,Rs,#imm ; BR (counter loops: ADD R1,R1,#-1 ; BRp)."""
+        f, m, fired = cpu.reg.file, cpu.mem.mem, self.fired
+        pc1 = pc + 1
+        d, s = (w >> 9) & 0x7, (w >> 6) & 0x7
+        imm = _sext(w & 0x1F, 5) & 0xFFFF
+        nzp = (w2 >> 9) & 0x7
+        after = (pc + 2) & 0xFFFF
+        target = (after + _sext(w2 & 0x1FF, 9)) & 0xFFFF
+
+        def h():
+            if m[pc1] != w2:
+                return False
+            v = (f[s] + imm) & 0xFFFF
+            f[d] = v
+            cc = CC[v]
+            f[PSR] = (f[PSR] & 0xFFF8) | cc
+            f[IR] = w2
+            f[PC] = target if cc & nzp else after
+            fired[0] += 1
+            return True
+        return h
+
+    def _ldr_add(self, cpu, pc, w, w2):
+        """LDR Rd,Rs,#off ; ADD (array walks: load an element, then accumulate)."""
+        f, m, fired = cpu.reg.file, cpu.mem.mem, self.fired
+        pc1 = pc + 1
+        d, s = (w >> 9) & 0x7, (w >> 6) & 0x7
+        off = _sext(w & 0x3F, 6)
+        d2, s2 = (w2 >> 9) & 0x7, (w2 >> 6) & 0x7
+        after = (pc + 2) & 0xFFFF
+        if (w2 >> 5) & 1:
+            imm = _sext(w2 & 0x1F, 5) & 0xFFFF
+
+            def h():
+                if m[pc1] != w2:
+                    return False
+                a = (f[s] + off) & 0xFFFF
+                if a >= MMIO_BASE:
+                    return False
+                f[d] = m[a]
+                v = (f[s2] + imm) & 0xFFFF
+                f[d2] = v
+                f[PSR] = (f[PSR] & 0xFFF8) | CC[v]
+                f[IR] = w2
+                f[PC] = after
+                fired[1] += 1
+                return True
+        else:
+            t = w2 & 0x7
+
+            def h():
+                if m[pc1] != w2:
+                    return False
+                a = (f[s] + off) & 0xFFFF
+                if a >= MMIO_BASE:
+                    return False
+                f[d] = m[a]
+                v = (f[s2] + f[t]) & 0xFFFF
+                f[d2] = v
+                f[PSR] = (f[PSR] & 0xFFF8) | CC[v]
+                f[IR] = w2
+                f[PC] = after
+                fired[1] += 1
+                return True
+        return h
+
+    def _load_const(self, cpu, pc, w, w2):
+        """AND Rd,Rs,#0 ; ADD Rd2,Rd,#imm (load a small constant)."""
+        f, m, fired = cpu.reg.file, cpu.mem.mem, self.fired
+        pc1 = pc + 1
+        d, d2 = (w >> 9) & 0x7, (w2 >> 9) & 0x7
+        v = _sext(w2 & 0x1F, 5) & 0xFFFF
+        cc = CC[v]
+        after = (pc + 2) & 0xFFFF
+
+        def h():
+            if m[pc1] != w2:
+                return False
+            f[d] = 0
+            f[d2] = v
+            f[PSR] = (f[PSR] & 0xFFF8) | cc
+            f[IR] = w2
+            f[PC] = after
+            fired[2] += 1
+            return True
+        return h
+
+
+# fusion 종류 (PredecodedEngine.fired 의 인덱스 순서)
+FUSIONS = ("add_br", "ldr_add", "load_const")
+
+
+def _nop():
+    pass
+
+
+def _is_back_branch(w: int) -> bool:
+    """Conditional BR (nzp != 000) with a negative offset."""
+    return not w >> 12 and bool(w & 0x0E00) and bool(w & 0x100)
+
+
+ENGINES = {
+    ReferenceEngine.name: ReferenceEngine,
+    PredecodedEngine.name: PredecodedEngine,
+}
+
+
+def get_engine(engine="reference"):
+    """Return an engine instance from a registry name (instances pass through)."""
+    if not isinstance(engine, str):
+        return engine
+    try:
+        return ENGINES[engine]()
+    except KeyError:
+        raise ValueError(f"unknown engine {engine!r}; "
+                         f"available: {', '.join(ENGINES)}") from None
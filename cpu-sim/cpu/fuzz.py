@@ -0,0 +1,360 @@
+"""Differential fuzzing: every execution engine against the reference interpreter.
+
+Random but well-formed LC-3 programs and machine states are executed by
+`CPU.step()` one basic block at a time; after each block every other engine
+runs the same number of instructions on its own copy of the state and the
+register file, run flag and error are compared (cheap array compares).
+Memory and the console (a 128 KiB compare) are checked every `CHECK_EVERY`
+instructions and at the end of the case; a mismatch there is bisected down
+to the first diverging instruction. Mismatches are shrunk to a small
+reproducer.
+
+    python -m cpu.fuzz --seconds 60 --workers 8
+"""
+import os
+import random
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+from .cpu_core import CPU
+from .devices import KBSR, KBDR, DSR, DDR, MCR
+from .engines import ENGINES, ReferenceEngine, get_engine
+from .interrupts import INT_VECTOR_TABLE
+from .registers import GENERAL_REGS, REG_COUNT, IR
+from .runner import load_image
+
+ORIGIN = 0x3000
+PROGRAM_LEN = 48
+DATA_LEN = 32
+CONTROL_OPS = frozenset((0b0000, 0b0100, 0b1000, 0b1100, 0b1111))   # 블록 종료
+CHECK_EVERY = 256       # 메모리/콘솔 비교 간격 (명령 수); 불일치 위치는 이분 탐색
+
+# (opcode, weight) — ALU/분기 위주, 1101(illegal) 은 만들지 않음
+_OPS = [(0b0001, 20), (0b0101, 12), (0b1001, 5), (0b0000, 14), (0b0010, 5),
+        (0b1010, 4), (0b0110, 6), (0b1110, 3), (0b0011, 5), (0b1011, 4),
+        (0b0111, 6), (0b1100, 2), (0b0100, 3), (0b1111, 1), (0b1000, 1)]
+_OPCODES = [op for op, _ in _OPS]
+_WEIGHTS = [w for _, w in _OPS]
+_POINTERS = (KBSR, KBDR, DSR, DDR, MCR)
+
+
+class Case:
+    """One fuzz input: program+data image at `origin`, registers, keyboard input, budget."""
+    __slots__ = ("seed", "origin", "words", "regs", "inputs", "budget")
+
+    def __init__(self, seed, origin, words, regs, inputs, budget):
+        self.seed = seed
+        self.origin = origin
+        self.words = list(words)
+        self.regs = tuple(regs)
+        self.inputs = bytes(inputs)
+        self.budget = budget
+
+    def replace(self, **kw):
+        args = {k: getattr(self, k) for k in self.__slots__}
+        args.update(kw)
+        return Case(**args)
+
+    def __repr__(self) -> str:
+        used = len(self.words)
+        while used and not self.words[used - 1]:
+            used -= 1
+        lines = [f"Case(seed={self.seed}, budget={self.budget}, inputs={self.inputs!r})",
+                 "  regs: " + " ".join(f"{v:04X}" for v in self.regs)]
+        lines += [f"  x{self.origin + i:04X}: {w:04X}"
+                  for i, w in enumerate(self.words[:used]) if w]
+        return "\n".join(lines)
+
+
+# ─────────────────────────── generation ──────────────────────────────
+def random_instruction(rng: random.Random) -> int:
+    op = rng.choices(_OPCODES, _WEIGHTS)[0]
+    d, s, t = rng.randrange(8), rng.randrange(8), rng.randrange(8)
+    near = rng.randint(-8, PROGRAM_LEN + DATA_LEN)     # 대부분 프로그램/데이터 영역
+    if op in (0b0001, 0b0101):
+        if rng.random() < 0.6:
+            return (op << 12) | (d << 9) | (s << 6) | 0x20 | rng.randrange(32)
+        return (op << 12) | (d << 9) | (s << 6) | t
+    if op == 0b1001:
+        return (op << 12) | (d << 9) | (s << 6) | 0x3F
+    if op == 0b0000:
+        return (rng.randrange(8) << 9) | (rng.randint(-12, 12) & 0x1FF)
+    if op in (0b0010, 0b1010, 0b1110, 0b0011, 0b1011):
+        return (op << 12) | (d << 9) | (near & 0x1FF)
+    if op in (0b0110, 0b0111):
+        return (op << 12) | (d << 9) | (s << 6) | rng.randrange(64)
+    if op == 0b1100:
+        return (op << 12) | (s << 6)
+    if op == 0b0100:
+        if rng.random() < 0.7:
+            return (op << 12) | 0x800 | (rng.randint(-12, 12) & 0x7FF)
+        return (op << 12) | (s << 6)
+    if op == 0b1111:
+        return (op << 12) | rng.randrange(256)
+    return 0x8000                                         # RTI
+
+
+def random_case(seed: int) -> Case:
+    rng = random.Random(seed)
+    prog = [random_instruction(rng) for _ in range(PROGRAM_LEN)]
+    data = [rng.choice(_POINTERS) if rng.random() < 0.1 else rng.randrange(0x10000)
+            for _ in range(DATA_LEN)]
+    regs = [rng.randrange(0x10000) for _ in range(GENERAL_REGS)]
+    # 절반은 레지스터를 프로그램/데이터 근처 주소로 (LDR/STR/JMP 가 의미 있게)
+    for i in range(GENERAL_REGS):
+        if rng.random() < 0.5:
+            regs[i] = ORIGIN + rng.randrange(PROGRAM_LEN + DATA_LEN)
+    psr = ((rng.random() < 0.25) << 15) | (rng.randrange(8) << 8) | rng.choice((1, 2, 4))
+    pc, ir = ORIGIN, 0
+    ssp, usp = ORIGIN - 0x10, ORIGIN - 0x100
+    regs += [pc, ir, psr, ssp, usp, 0]
+    inputs = bytes(rng.randrange(32, 127) for _ in range(rng.randrange(4)))
+    return Case(seed, ORIGIN, prog + data, regs, inputs, rng.randint(200, 2000))
+
+
+def build_cpu(case: Case) -> CPU:
+    cpu = CPU()
+    # TRAP / INT 벡터는 프로그램 안쪽을 가리키게 해서 실행이 이어지도록
+    rng = random.Random(case.seed)
+    vectors = array("H", rng.choices(range(case.origin, case.origin + PROGRAM_LEN), k=0x100))
+    m = cpu.mem.mem
+    m[0:0x100] = vectors
+    m[INT_VECTOR_TABLE:INT_VECTOR_TABLE + 0x100] = vectors
+    load_image(cpu, case.words, case.origin)
+    cpu.reg.load(case.regs)
+    if case.inputs:
+        cpu.keyboard.feed(case.inputs)
+    cpu.running = True
+    return cpu
+
+
+# ─────────────────────────── comparison ──────────────────────────────
+def diff_state(a: CPU, b: CPU, memory: bool = True):
+    """Describe the first architectural difference between two CPUs, or None."""
+    fa, fb = a.reg.file, b.reg.file
+    if fa != fb:
+        i = next(i for i in range(REG_COUNT) if fa[i] != fb[i])
+        return f"register #{i}: {fa[i]:04X} != {fb[i]:04X}"
+    ma, mb = a.mem.mem, b.mem.mem
+    if memory and ma != mb:
+        addr = next(i for i in range(len(ma)) if ma[i] != mb[i])
+        return f"memory x{addr:04X}: {ma[addr]:04X} != {mb[addr]:04X}"
+    if a.running != b.running:
+        return f"running: {a.running} != {b.running}"
+    if a.display.output != b.display.output:
+        return f"output: {bytes(a.display.output)!r} != {bytes(b.display.output)!r}"
+    ka, kb = a.keyboard, b.keyboard
+    if (ka.buffer, ka.data, ka.ready, ka.ie) != (kb.buffer, kb.data, kb.ready, kb.ie):
+        return "keyboard state differs"
+    if a.intc.pending != b.intc.pending:
+        return "interrupt pending flag differs"
+    return None
+
+
+class Mismatch:
+    __slots__ = ("case", "engine", "step", "detail")
+
+    def __init__(self, case, engine, step, detail):
+        self.case = case
+        self.engine = engine
+        self.step = step
+        self.detail = detail
+
+    def __repr__(self) -> str:
+        return (f"Mismatch({self.engine} after step {self.step}: {self.detail})\n"
+                f"{self.case!r}")
+
+
+def _candidates(engines):
+    if engines is None:
+        engines = [n for n in ENGINES if n != ReferenceEngine.name]
+    return [get_engine(e) for e in engines]
+
+
+def compare(case: Case, engines=None):
+    """Run `case` block by block on the reference and on `engines`.
+
+    Returns `(instructions, Mismatch or None)`."""
+    ref = build_cpu(case)
+    others = [(eng, build_cpu(case)) for eng in _candidates(engines)]
+    f = ref.reg.file
+    step = ref.step
+    budget = case.budget
+    done = checked = 0
+    while done < budget and ref.running:
+        # 레퍼런스로 basic block 하나 전진
+        n, err = 0, None
+        try:
+            while done + n < budget and ref.running:
+                step()
+                n += 1
+                if f[IR] >> 12 in CONTROL_OPS:
+                    break
+        except RuntimeError as e:
+            err = str(e)
+        done += n
+        full = err or done >= budget or not ref.running or done - checked >= CHECK_EVERY
+        for eng, cpu in others:
+            steps, e_err = eng.run(cpu, n + (1 if err else 0))
+            if steps != n or e_err != err:
+                return done, Mismatch(case, eng.name, done,
+                                      f"steps/error {steps}/{e_err!r} != {n}/{err!r}")
+            if cpu.reg.file != f or cpu.running != ref.running:
+                return done, Mismatch(case, eng.name, done, diff_state(ref, cpu, memory=False))
+            if full:
+                detail = diff_state(ref, cpu)
+                if detail:
+                    return done, _locate(case, eng, checked, done, detail)
+        if full:
+            checked = done
+        if err:
+            break
+    return done, None
+
+
+def _probe(case: Case, eng, budget: int):
+    """Difference between the reference and `eng` after `budget` instructions
+    from the initial state of `case` (each in a single run), or None."""
+    ref, cpu = build_cpu(case), build_cpu(case)
+    n, err = ReferenceEngine().run(ref, budget)
+    steps, e_err = eng.run(cpu, budget)
+    if steps != n or e_err != err:
+        return f"steps/error {steps}/{e_err!r} != {n}/{err!r}"
+    return diff_state(ref, cpu)
+
+
+def _locate(case: Case, eng, good: int, bad: int, detail: str) -> Mismatch:
+    """Bisect between checkpoints `good` (states agreed) and `bad` (they did
+    not) for the first instruction count at which `eng` diverges."""
+    d = _probe(case, eng, bad)
+    if d is None:
+        # 체크포인트 단위로 나눠 실행할 때만 드러나는 불일치: 그 위치로 보고
+        return Mismatch(case, eng.name, bad, detail)
+    lo, hi, detail = good, bad, d
+    while hi - lo > 1:
+        mid = (lo + hi) // 2
+        d = _probe(case, eng, mid)
+        if d:
+            hi, detail = mid, d
+        else:
+            lo = mid
+    return Mismatch(case, eng.name, hi, detail)
+
+
+def minimize(mismatch: Mismatch, engine=None) -> Mismatch:
+    """Shrink a failing case: smallest budget, then NOP out words and zero registers."""
+    engine = engine if engine is not None else mismatch.engine
+    case = mismatch.case
+
+    def failing(c):
+        return compare(c, [engine])[1]
+
+    best = failing(case) or mismatch
+    # 1. 명령 수: 불일치가 유지되는 최소 budget (이분 탐색)
+    lo, hi = 1, min(case.budget, best.step + 1)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if failing(case.replace(budget=mid)):
+            hi = mid
+        else:
+            lo = mid + 1
+    case = case.replace(budget=hi)
+    # 2. 프로그램/데이터 워드를 0 (BR never == NOP) 으로
+    for i in range(len(case.words)):
+        if case.words[i]:
+            words = list(case.words)
+            words[i] = 0
+            trial = case.replace(words=words)
+            if failing(trial):
+                case = trial
+    # 3. 범용 레지스터 0 으로, 입력 제거
+    for i in range(GENERAL_REGS):
+        if case.regs[i]:
+            regs = list(case.regs)
+            regs[i] = 0
+            trial = case.replace(regs=regs)
+            if failing(trial):
+                case = trial
+    if case.inputs and failing(case.replace(inputs=b"")):
+        case = case.replace(inputs=b"")
+    return failing(case) or best
+
+
+# ─────────────────────────── driver ──────────────────────────────────
+def fuzz_worker(seed: int, seconds: float, engines=None, max_failures: int = 3) -> dict:
+    """Fuzz until the deadline; returns counts and minimized mismatches."""
+    deadline = time.perf_counter() + seconds
+    cases = instructions = 0
+    failures = []
+    while time.perf_counter() < deadline and len(failures) < max_failures:
+        case = random_case(seed + cases)
+        n, mismatch = compare(case, engines)
+        cases += 1
+        instructions += n
+        if mismatch is not None:
+            failures.append(repr(minimize(mismatch)))
+    return {"cases": cases, "instructions": instructions, "failures": failures}
+
+
+class FuzzReport:
+    __slots__ = ("cases", "instructions", "elapsed", "workers", "engines", "failures")
+
+    def __init__(self, cases, instructions, elapsed, workers, engines, failures):
+        self.cases = cases
+        self.instructions = instructions
+        self.elapsed = elapsed
+        self.workers = workers
+        self.engines = engines
+        self.failures = failures
+
+    @property
+    def rate(self) -> float:
+        """Instructions compared per second (reference steps × candidate engines)."""
+        return self.instructions * len(self.engines) / self.elapsed if self.elapsed else 0.0
+
+    def __repr__(self) -> str:
+        return (f"FuzzReport({self.cases} cases, {self.instructions} instructions, "
+                f"{self.rate:,.0f} instr/s compared on {self.workers} workers, "
+                f"{len(self.failures)} failures)")
+
+
+def fuzz(seconds: float, workers: int = None, seed: int = None, engines=None) -> FuzzReport:
+    """Time-boxed fuzzing across a process pool (`workers=1` runs in-process)."""
+    workers = workers or os.cpu_count() or 1
+    seed = random.randrange(1 << 32) if seed is None else seed
+    names = [n for n in ENGINES if n != ReferenceEngine.name] if engines is None else list(engines)
+    t0 = time.perf_counter()
+    seeds = [seed + i * 1_000_003 for i in range(workers)]
+    if workers == 1:
+        results = [fuzz_worker(seeds[0], seconds, names)]
+    else:
+        with ProcessPoolExecutor(workers) as pool:
+            futs = [pool.submit(fuzz_worker, s, seconds, names) for s in seeds]
+            results = [fut.result() for fut in futs]
+    elapsed = time.perf_counter() - t0
+    return FuzzReport(sum(r["cases"] for r in results),
+                      sum(r["instructions"] for r in results),
+                      elapsed, workers, names,
+                      [f for r in results for f in r["failures"]])
+
+
+def main(argv=None):
+    import argparse
+    ap = argparse.ArgumentParser(prog="python -m cpu.fuzz",
+                                 description="Differential fuzzing of execution engines.")
+    ap.add_argument("--seconds", type=float, default=10.0)
+    ap.add_argument("--workers", type=int, default=None)
+    ap.add_argument("--seed", type=int, default=None)
+    ap.add_argument("--engine", action="append", choices=sorted(ENGINES),
+                    help="engine to check (repeatable; default: all but reference)")
+    args = ap.parse_args(argv)
+    report = fuzz(args.seconds, args.workers, args.seed, args.engine)
+    print(report)
+    for failure in report.failures:
+        print(failure)
+    return 1 if report.failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,110 @@
+"""Idle-loop and busy-wait detection with exact fast-forward.
+
+Called by an engine whenever a backward BR is taken. Two loop shapes are
+skipped without executing their iterations, and the skipped instructions
+are added to the step count so runs stay deterministic:
+
+    counter loop   ADD Rx,Rx,#±1 ; BR back     (delay loops, countdowns)
+        The number of further taken iterations is computed from Rx and the
+        BR condition; Rx and CC are set to their value after that many.
+
+    fixed point    a body of loads/ALU ops only ; BR back
+        (e.g. `LDI R0,KBSR ; BRzp back`). If two consecutive arrivals at the
+        loop head see identical registers, PSR and keyboard state, and the
+        body cannot store, every further iteration is identical until a
+        device changes. Headless, nothing can change it, so the remaining
+        budget is consumed in whole iterations. An optional `wait()` callback
+        (returns True if input arrived) lets interactive hosts sleep instead.
+
+Nothing is skipped while an interrupt request is pending.
+"""
+from .memory import MMIO_BASE
+from .registers import GENERAL_REGS, PC, PSR, CC
+
+MAX_BODY = 16
+FOREVER = 1 << 62
+# 상태를 바꾸지 않는 명령만 (store / 제어 흐름 / TRAP 제외). BR 은 nzp=000 (NOP) 만 허용
+_PURE_OPS = frozenset((0b0001, 0b0101, 0b1001, 0b0010, 0b1010, 0b0110, 0b1110, 0b0000))
+
+
+def taken_run(v: int, imm: int, nzp: int) -> int:
+    """How many consecutive results v+imm, v+2·imm, ... have a CC in `nzp` (imm = ±1)."""
+    r = (v + imm) & 0xFFFF
+    count = 0
+    while count < 0x10000:
+        cc = CC[r]
+        if not cc & nzp:
+            return count
+        if cc == 2:                                 # Z: 한 값뿐
+            run = 1
+        elif imm < 0:
+            run = r if cc == 1 else r - 0x7FFF      # P: r..1, N: r..x8000
+        else:
+            run = 0x8000 - r if cc == 1 else 0x10000 - r
+        count += run
+        r = (r + imm * run) & 0xFFFF
+    return FOREVER                                  # 모든 CC 가 조건에 포함 → 무한 루프
+
+
+class IdleLoopDetector:
+    def __init__(self, wait=None):
+        self.wait = wait
+        self.skipped = 0          # fast-forward 로 건너뛴 명령 수
+        self.loops = 0            # fast-forward 횟수
+        self._last = None
+
+    def reset(self) -> None:
+        self._last = None
+
+    def skip(self, cpu, br_pc: int, steps: int, budget: int) -> int:
+        """A backward BR at `br_pc` was just taken as instruction number `steps`.
+
+        Returns how many instructions (≤ `budget`) were fast-forwarded."""
+        f = cpu.reg.file
+        head = f[PC]
+        n = br_pc - head + 1
+        if n <= 0 or n > MAX_BODY or br_pc >= MMIO_BASE or cpu.intc.pending:
+            self._last = None
+            return 0
+        m = cpu.mem.mem
+        k = self._counter_loop(f, m, head, br_pc, budget) if n == 2 else 0
+        if not k:
+            k = self._fixed_point(cpu, f, m, head, br_pc, n, steps, budget)
+        if k:
+            self.skipped += k
+            self.loops += 1
+        return k
+
+    @staticmethod
+    def _counter_loop(f, m, head, br_pc, budget) -> int:
+        w = m[head]
+        if w >> 12 != 0b0001 or not w & 0x20:
+            return 0
+        d = (w >> 9) & 0x7
+        imm = (w & 0x1F) - ((w & 0x10) << 1)         # sext(imm5)
+        if (w >> 6) & 0x7 != d or imm not in (1, -1):
+            return 0
+        k = min(taken_run(f[d], imm, (m[br_pc] >> 9) & 0x7), budget // 2)
+        if k <= 0:
+            return 0
+        v = (f[d] + k * imm) & 0xFFFF
+        f[d] = v
+        f[PSR] = (f[PSR] & 0xFFF8) | CC[v]
+        return 2 * k
+
+    def _fixed_point(self, cpu, f, m, head, br_pc, n, steps, budget) -> int:
+        for w in m[head:br_pc]:
+            op = w >> 12
+            if op not in _PURE_OPS or (op == 0 and w & 0x0E00):
+                self._last = None
+                return 0
+        kb = cpu.keyboard
+        state = (f[:GENERAL_REGS], f[PSR], kb.ready, kb.data, len(kb.buffer), kb.ie)
+        last = self._last
+        self._last = (br_pc, steps, state)
+        if last is None or last[0] != br_pc or steps - last[1] != n or last[2] != state:
+            return 0
+        if self.wait is not None and self.wait():
+            self._last = None
+            return 0                                 # 입력이 도착함: 정상 실행 계속
+        return (budget // n) * n
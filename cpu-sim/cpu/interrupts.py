@@ -0,0 +1,45 @@
+"""LC-3 device interrupt controller.
+
+Devices assert a request line with a priority (PL0..PL7) and withdraw it
+once serviced. The CPU never polls devices: it only tests the controller's
+single `pending` flag at each instruction boundary and, when it is set,
+asks for the highest-priority request above the current PSR[10:8] level.
+"""
+
+INT_VECTOR_TABLE = 0x0100   # INT vector table x0100–x01FF
+KBD_VECTOR = 0x80           # keyboard → x0180
+DISPLAY_VECTOR = 0x81       # display  → x0181
+DEVICE_PRIORITY = 4         # PL4: LC-3 keyboard/display priority
+
+
+class InterruptController:
+    """Level-triggered request lines, one per interrupt vector."""
+    __slots__ = ("pending", "_lines")
+
+    def __init__(self):
+        self.pending = False     # 요청이 하나라도 있으면 True (CPU 가 명령 경계마다 확인)
+        self._lines = {}         # vector -> priority
+
+    def request(self, vector: int, priority: int) -> None:
+        """Assert the request line for `vector` at `priority` (0–7)."""
+        if not 0 <= priority <= 7:
+            raise ValueError(f"priority {priority} out of range 0..7")
+        self._lines[vector & 0xFF] = priority
+        self.pending = True
+
+    def withdraw(self, vector: int) -> None:
+        """Deassert the request line for `vector` (no-op if not raised)."""
+        self._lines.pop(vector & 0xFF, None)
+        self.pending = bool(self._lines)
+
+    def highest(self, level: int):
+        """Return `(vector, priority)` of the strongest request above `level`, else None."""
+        best = None
+        for vector, prio in self._lines.items():
+            if prio > level and (best is None or prio > best[1]):
+                best = (vector, prio)
+        return best
+
+    def clear(self) -> None:
+        self._lines.clear()
+        self.pending = False
@@ -1,32 +1,102 @@
-MEM_SIZE = 256  # Number of 16-bit words in memory
+import sys
+from array import array
+
+MEM_SIZE = 0x10000  # Number of 16-bit words in memory (full LC-3 address space)
+MMIO_BASE = 0xFE00  # xFE00–xFFFF: device registers (KBSR, KBDR, DSR, DDR, MCR ...)
+
 
 class Memory:
     def __init__(self):
-        self.mem = [0]*MEM_SIZE
+        self.mem = array("H", bytes(2 * MEM_SIZE))
+        self.mmio = {}   # addr -> (read_fn, write_fn, peek_fn); unmapped I/O addresses act as RAM
+
+    def map_io(self, addr: int, read, write, peek=None):
+        """Route reads/writes of `addr` (>= MMIO_BASE) to a device.
+
+        `peek` returns the register value without side effects (for viewers);
+        without one, `peek()` shows the backing RAM word instead of calling `read`."""
+        if not MMIO_BASE <= addr <= 0xFFFF:
+            raise ValueError(f"x{addr:04X} is outside the device register page")
+        self.mmio[addr] = (read, write, peek)
 
     def read(self, addr: int) -> int:
         """Read a 16-bit word from memory"""
-        return self.mem[addr & 0xFF]
+        addr &= 0xFFFF
+        if addr >= MMIO_BASE:
+            dev = self.mmio.get(addr)
+            if dev is not None:
+                return dev[0]() & 0xFFFF
+        return self.mem[addr]
+
+    def peek(self, addr: int) -> int:
+        """Read a word for display: like read() but never runs a device's read handler"""
+        addr &= 0xFFFF
+        if addr >= MMIO_BASE:
+            dev = self.mmio.get(addr)
+            if dev is not None and dev[2] is not None:
+                return dev[2]() & 0xFFFF
+        return self.mem[addr]
 
     def write(self, addr: int, value: int):
         """Write a 16-bit word to memory"""
-        self.mem[addr & 0xFF] = value & 0xFFFF  # Mask to 16 bits
-    
+        addr &= 0xFFFF
+        if addr >= MMIO_BASE:
+            dev = self.mmio.get(addr)
+            if dev is not None:
+                dev[1](value & 0xFFFF)
+                return
+        self.mem[addr] = value & 0xFFFF  # Mask to 16 bits
+
     def read_byte(self, addr: int) -> int:
         """Read an 8-bit byte from memory (for backward compatibility)"""
         word_addr = addr >> 1  # Divide by 2 to get word address
-        word = self.mem[word_addr & 0xFF]
+        word = self.mem[word_addr & 0xFFFF]
         if addr & 1:  # Odd address, return high byte
             return (word >> 8) & 0xFF
         else:  # Even address, return low byte
             return word & 0xFF
-    
+
     def write_byte(self, addr: int, value: int):
         """Write an 8-bit byte to memory (for backward compatibility)"""
         word_addr = addr >> 1  # Divide by 2 to get word address
-        word = self.mem[word_addr & 0xFF]
+        word = self.mem[word_addr & 0xFFFF]
         if addr & 1:  # Odd address, modify high byte
             word = (word & 0x00FF) | ((value & 0xFF) << 8)
         else:  # Even address, modify low byte
             word = (word & 0xFF00) | (value & 0xFF)
-        self.mem[word_addr & 0xFF] = word
+        self.mem[word_addr & 0xFFFF] = word
+
+    def find(self, pattern, start: int = 0):
+        """Word address of the first match at or after `start` (wrapping), or None.
+
+        `pattern` is a word, a sequence of words, or `bytes` matched against
+        memory as a byte stream in `read_byte` order (low byte first). The
+        search runs over the RAM array with `bytes.find`, so device registers
+        are matched by their backing words, not by calling the devices."""
+        if isinstance(pattern, int):
+            pattern = [pattern]
+        if isinstance(pattern, (bytes, bytearray)):
+            needle, step = bytes(pattern), 1
+        else:
+            needle, step = array("H", [w & 0xFFFF for w in pattern]), 2
+            if sys.byteorder == "big":
+                needle.byteswap()
+            needle = needle.tobytes()
+        if not needle:
+            return None
+        if sys.byteorder == "big":
+            words = array("H", self.mem)
+            words.byteswap()
+            hay = words.tobytes()
+        else:
+            hay = self.mem.tobytes()
+        # wrap 검색: 끝에 앞부분을 이어 붙여 한 번의 find 로 처리
+        hay += hay[:len(needle) - 1]
+        start = (start & 0xFFFF) * 2
+        for lo, hi in ((start, len(hay)), (0, start + len(needle) - 1)):
+            i = hay.find(needle, lo, hi)
+            while i >= 0 and i % step:              # 워드 패턴은 워드 경계에서만
+                i = hay.find(needle, i + 1, hi)
+            if i >= 0:
+                return (i >> 1) & 0xFFFF
+        return None
@@ -1,24 +1,88 @@
-from dataclasses import dataclass, field
-from typing import List
+from array import array
 
 GENERAL_REGS = 8
-SPECIAL_REGS = ["PC", "IR", "CPSR"]
+SPECIAL_REGS = ["PC", "IR", "CPSR", "SSP", "USP", "LR"]
+# SPECIAL_REGS 와 같은 순서의 속성 이름 (GUI 표시용)
+SPECIAL_ATTRS = ["pc", "ir", "cpsr", "saved_ssp", "saved_usp", "lr"]
+
+# flat register-file 인덱스: R0..R7 다음에 특수 레지스터
+PC, IR, PSR, SSP, USP, LR = range(GENERAL_REGS, GENERAL_REGS + len(SPECIAL_REGS))
+REG_COUNT = GENERAL_REGS + len(SPECIAL_REGS)
+
+_ZERO = array("H", [0]) * REG_COUNT
+
+# PSR[2:0] for every 16-bit result: Z for 0, P for x0001–x7FFF, N otherwise
+CC = bytes([2]) + bytes([1]) * 0x7FFF + bytes([4]) * 0x8000
+
+
+def _special(idx: int, doc: str):
+    def get(self) -> int:
+        return self.file[idx]
+
+    def set(self, value: int) -> None:
+        self.file[idx] = value & 0xFFFF
+    return property(get, set, doc=doc)
 
 
-@dataclass
 class Registers:
-    gpr: List[int] = field(default_factory=lambda: [0]*GENERAL_REGS)
-    pc: int = 0
-    ir: int = 0
-    cpsr: int = 0
+    """
+    LC-3 레지스터 파일. 모든 값은 16-bit.
+    ─────────────────────────────────────────────────────
+    • reg[i] / reg[i] = v : R0..R7 (범위 검사 + 16-bit 마스크)
+    • reg.pc / ir / cpsr / saved_ssp / saved_usp / lr
+    • reg.file            : 검사 없는 fast path (array('H'), 아래 인덱스 참고)
+
+    `file` 은 R0..R7, PC, IR, PSR, SSP, USP, LR 순서의 flat array 이다.
+    실행 엔진은 `f = reg.file; f[rd] = v` 처럼 직접 접근할 수 있으며,
+    이 경우 인덱스 검사는 없고 값은 호출 측에서 0..0xFFFF 로 마스크해야 한다
+    (범위를 벗어나면 array 가 OverflowError 를 낸다).
+    """
+    __slots__ = ("file",)
+
+    def __init__(self):
+        self.file = array("H", _ZERO)
+
+    pc        = _special(PC,  "Program counter")
+    ir        = _special(IR,  "Instruction register")
+    cpsr      = _special(PSR, "Processor status register (PSR)")
+    saved_ssp = _special(SSP, "Saved supervisor stack pointer (Saved_SSP)")
+    saved_usp = _special(USP, "Saved user stack pointer (Saved_USP)")
+    lr        = _special(LR,  "Link register (shown by the register panel)")
+
+    @property
+    def gpr(self) -> list:
+        """Copy of R0..R7."""
+        return self.file[:GENERAL_REGS].tolist()
 
     def __getitem__(self, idx: int) -> int:
         if 0 <= idx < GENERAL_REGS:
-            return self.gpr[idx]
+            return self.file[idx]
         raise IndexError("Invalid register index")
 
     def __setitem__(self, idx: int, value: int) -> None:
         if 0 <= idx < GENERAL_REGS:
-            self.gpr[idx] = value & 0xFFFFFFFF
+            self.file[idx] = value & 0xFFFF
         else:
-            raise IndexError("Invalid register index")
\ No newline at end of file
+            raise IndexError("Invalid register index")
+
+    # ─────────────────────────── snapshot ────────────────────────────
+    def as_tuple(self) -> tuple:
+        """All registers in `file` order (R0..R7, PC, IR, PSR, SSP, USP, LR)."""
+        return tuple(self.file)
+
+    def load(self, values) -> None:
+        """Restore a snapshot produced by `as_tuple()` in one bulk copy."""
+        if len(values) != REG_COUNT:
+            raise ValueError(f"expected {REG_COUNT} register values, got {len(values)}")
+        self.file[:] = array("H", values)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Registers):
+            return NotImplemented
+        return self.file == other.file
+
+    def __repr__(self) -> str:
+        gpr = " ".join(f"R{i}={v:04X}" for i, v in enumerate(self.file[:GENERAL_REGS]))
+        spec = " ".join(f"{n}={self.file[i]:04X}"
+                        for i, n in enumerate(SPECIAL_REGS, GENERAL_REGS))
+        return f"Registers({gpr} {spec})"
@@ -0,0 +1,171 @@
+"""Versioned binary save states for checkpointing and resuming simulations.
+
+    cpu.save_state("run.lc3s")              # or save_state(cpu, path, ...)
+    other = CPU(); other.load_state("run.lc3s")
+
+Layout (all integers little-endian):
+
+    header   magic b"LC3S" | version u16 | flags u16 | body length u32 | crc32 u32
+    body     (zlib-compressed when FLAG_ZLIB)
+             registers   REG_COUNT × u16, in `Registers.as_tuple()` order
+                         (R0–R7, PC, IR, PSR, saved SSP, saved USP, LR)
+             meta        length u32 + JSON {"running", "devices"}
+             memory      raw:    65536 × u16
+                         sparse: page count u16, then (page u16, 256 × u16) for
+                                 every 256-word page that is not all zero
+
+The CRC covers the body exactly as stored, so corruption is detected before
+anything is decompressed or written into the CPU. Memory is copied in one
+slice assignment per page (one in total for raw), never word by word.
+"""
+import json
+import os
+import struct
+import sys
+import zlib
+from array import array
+
+from .devices import device_state, restore_device_state
+from .memory import MEM_SIZE
+from .registers import REG_COUNT
+
+MAGIC = b"LC3S"
+VERSION = 1
+FLAG_ZLIB = 0x1
+FLAG_SPARSE = 0x2
+
+PAGE_WORDS = 256
+PAGE_BYTES = 2 * PAGE_WORDS
+_HEADER = struct.Struct("<4sHHII")
+_REGS = struct.Struct(f"<{REG_COUNT}H")
+_ZERO_PAGE = bytes(PAGE_BYTES)
+
+
+def _le_bytes(words: array) -> bytes:
+    """`words` as little-endian bytes regardless of host byte order."""
+    if sys.byteorder == "big":
+        words = array("H", words)
+        words.byteswap()
+    return words.tobytes()
+
+
+def save_state(cpu, path, compress: bool = True, sparse=None) -> int:
+    """Write the state of `cpu` to `path`; returns the file size in bytes.
+
+    `sparse=None` picks whichever memory encoding is smaller. The file is
+    written next to `path` and renamed over it, so an interrupted save never
+    destroys the previous checkpoint."""
+    mem = _le_bytes(cpu.mem.mem)
+    pages = [p for p in range(MEM_SIZE // PAGE_WORDS)
+             if mem[p * PAGE_BYTES:(p + 1) * PAGE_BYTES] != _ZERO_PAGE]
+    if sparse is None:
+        sparse = len(pages) * (2 + PAGE_BYTES) + 2 < len(mem)
+    meta = json.dumps({"running": cpu.running, "devices": device_state(cpu)}).encode()
+    parts = [_REGS.pack(*cpu.reg.as_tuple()), struct.pack("<I", len(meta)), meta]
+    if sparse:
+        parts.append(struct.pack("<H", len(pages)))
+        for p in pages:
+            parts.append(struct.pack("<H", p))
+            parts.append(mem[p * PAGE_BYTES:(p + 1) * PAGE_BYTES])
+    else:
+        parts.append(mem)
+    body = b"".join(parts)
+    flags = FLAG_SPARSE if sparse else 0
+    if compress:
+        body = zlib.compress(body, 6)
+        flags |= FLAG_ZLIB
+    header = _HEADER.pack(MAGIC, VERSION, flags, len(body), zlib.crc32(body))
+    tmp = f"{os.fspath(path)}.{os.getpid()}.tmp"     # 같은 디렉터리: os.replace 가 원자적
+    try:
+        with open(tmp, "wb") as f:
+            f.write(header)
+            f.write(body)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+    return len(header) + len(body)
+
+
+def load_state(cpu, path) -> None:
+    """Replace the state of `cpu` with the one saved in `path`.
+
+    Raises ValueError for files that are not save states, come from a newer
+    format version, fail the checksum or are malformed (bad zlib stream,
+    truncated layout, invalid meta block); `cpu` is untouched in that case."""
+    with open(path, "rb") as f:
+        data = f.read()
+    if len(data) < _HEADER.size:
+        raise ValueError(f"{path}: not a save state (too short)")
+    magic, version, flags, length, crc = _HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError(f"{path}: not a save state (bad magic {magic!r})")
+    if version > VERSION:
+        raise ValueError(f"{path}: save state version {version} is newer than "
+                         f"supported version {VERSION}")
+    body = memoryview(data)[_HEADER.size:]
+    if len(body) != length or zlib.crc32(body) != crc:
+        raise ValueError(f"{path}: checksum mismatch (file is truncated or corrupt)")
+    try:
+        if flags & FLAG_ZLIB:
+            body = memoryview(zlib.decompress(body))
+        regs = _REGS.unpack_from(body)
+        pos = _REGS.size
+        (meta_len,) = struct.unpack_from("<I", body, pos)
+        pos += 4
+        meta = json.loads(bytes(body[pos:pos + meta_len]))
+        _check_meta(meta)
+        pos += meta_len
+        if flags & FLAG_SPARSE:
+            (count,) = struct.unpack_from("<H", body, pos)
+            pos += 2
+            pages = []
+            for _ in range(count):
+                (p,) = struct.unpack_from("<H", body, pos)
+                if p >= MEM_SIZE // PAGE_WORDS or pos + 2 + PAGE_BYTES > len(body):
+                    raise ValueError(f"bad memory page {p}")
+                pages.append((p, body[pos + 2:pos + 2 + PAGE_BYTES]))
+                pos += 2 + PAGE_BYTES
+        elif len(body) - pos != 2 * MEM_SIZE:
+            raise ValueError("memory image has the wrong size")
+    except (struct.error, zlib.error, ValueError) as e:
+        raise ValueError(f"{path}: malformed save state ({e})") from None
+
+    # 검증이 모두 끝난 뒤에만 CPU 상태를 덮어쓴다
+    dst = memoryview(cpu.mem.mem).cast("B")
+    if flags & FLAG_SPARSE:
+        dst[:] = bytes(2 * MEM_SIZE)
+        for p, chunk in pages:
+            dst[p * PAGE_BYTES:(p + 1) * PAGE_BYTES] = chunk
+    else:
+        dst[:] = body[pos:]
+    if sys.byteorder == "big":
+        cpu.mem.mem.byteswap()
+    cpu.reg.load(regs)
+    restore_device_state(cpu, meta["devices"])
+    cpu.running = meta["running"]
+
+
+def _check_meta(meta) -> None:
+    """Validate the JSON meta block so that restoring it cannot fail halfway."""
+    if not isinstance(meta, dict) or not isinstance(meta.get("running"), bool):
+        raise ValueError("meta block lacks 'running'")
+    dev = meta.get("devices")
+    if not isinstance(dev, list) or len(dev) != 8:
+        raise ValueError("meta block lacks device state")
+    if not isinstance(dev[0], str) or not isinstance(dev[4], str):
+        raise ValueError("device buffers must be hex strings")
+    bytes.fromhex(dev[0])                           # 키보드 버퍼 / 디스플레이 출력 (hex)
+    bytes.fromhex(dev[4])
+    if not all(isinstance(dev[i], int) for i in (1, 2, 3, 5, 6)):
+        raise ValueError("device registers must be integers")
+    if not (0 <= dev[1] <= 0xFFFF and 0 <= dev[6] <= 0xFFFF):   # KBDR, MCR
+        raise ValueError("device register out of 16-bit range")
+    if not isinstance(dev[7], list) or not all(
+            isinstance(line, list) and len(line) == 2 and all(isinstance(v, int) for v in line)
+            and 0 <= line[0] <= 0xFF and 0 <= line[1] <= 7
+            for line in dev[7]):
+        raise ValueError("interrupt lines must be [vector 0..255, priority 0..7] pairs")
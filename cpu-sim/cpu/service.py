@@ -0,0 +1,359 @@
+"""Local batch-simulation service: HTTP/JSON (TCP or Unix socket) around `runner.run`.
+
+Jobs are queued in a bounded asyncio queue (backpressure: a submit waits up
+to `submit_timeout` for room, then gets HTTP 503) and dispatched to a pool
+of pre-warmed worker processes that keep the simulator imported. Each job
+streams newline-delimited JSON events back on its connection:
+
+    {"event": "queued",   "id": 7, "position": 2}
+    {"event": "started",  "id": 7}
+    {"event": "progress", "id": 7, "steps": 100000}
+    {"event": "result",   "id": 7, "steps": ..., "halted": ..., "output": ...}
+
+    POST /jobs   {"origin": 12288, "words": [...], "inputs": "abc",
+                  "budget": 1000000, "engine": "predecoded"}
+    GET  /stats  queue depth, throughput, latency percentiles
+    GET  /health
+
+    python -m cpu.service --port 8765 --workers 4
+"""
+import asyncio
+import json
+import multiprocessing
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+MAX_BODY = 1 << 20          # JSON 요청 최대 크기
+MAX_BUDGET = 1 << 32
+LATENCY_WINDOW = 1000       # 백분위 계산에 쓰는 최근 완료 작업 수
+
+_progress_queue = None      # worker 프로세스 쪽: 진행 상황을 부모로 보내는 큐
+
+
+# ─────────────────────────── worker side ─────────────────────────────
+def _init_worker(progress_queue):
+    """Pool initializer: import the simulator once per process."""
+    global _progress_queue
+    _progress_queue = progress_queue
+    from . import runner, engines   # noqa: F401  (warm import)
+
+
+def _warm():
+    return os.getpid()
+
+
+def _execute(job_id: int, spec: dict, progress_every: int) -> dict:
+    from .cpu_core import CPU
+    from .runner import load_image, run
+
+    def progress(steps):
+        _progress_queue.put((job_id, steps))
+
+    cpu = CPU()
+    load_image(cpu, spec["words"], spec["origin"])
+    result = run(cpu, spec["budget"], spec.get("inputs"), spec.get("engine", "reference"),
+                 progress=progress, progress_every=progress_every)
+    return {"steps": result.steps, "halted": result.halted, "error": result.error,
+            "output": result.output, "registers": list(cpu.reg.as_tuple()),
+            "elapsed": result.stats["elapsed"]}
+
+
+def validate(spec) -> dict:
+    """Check a job request; raises ValueError with a client-facing message."""
+    if not isinstance(spec, dict):
+        raise ValueError("job must be a JSON object")
+    words = spec.get("words")
+    if not isinstance(words, list) or not all(
+            _is_int(w) and 0 <= w <= 0xFFFF for w in words):
+        raise ValueError("'words' must be a list of 16-bit integers")
+    origin = spec.get("origin", 0x3000)
+    if not _is_int(origin) or not 0 <= origin <= 0xFFFF:
+        raise ValueError("'origin' must be a 16-bit address")
+    if origin + len(words) > 0x10000:               # load_image 가 x0000 으로 wrap 하지 않게
+        raise ValueError("'words' do not fit in memory above 'origin'")
+    budget = spec.get("budget")
+    if not _is_int(budget) or not 0 < budget <= MAX_BUDGET:
+        raise ValueError("'budget' must be a positive integer")
+    inputs = spec.get("inputs", "")
+    if not isinstance(inputs, str):
+        raise ValueError("'inputs' must be a string")
+    try:
+        inputs.encode("latin-1")                    # 키보드는 바이트 단위
+    except UnicodeEncodeError:
+        raise ValueError("'inputs' must be latin-1 text") from None
+    from .engines import ENGINES
+    engine = spec.get("engine", "reference")
+    if engine not in ENGINES:
+        raise ValueError(f"unknown engine {engine!r}")
+    return {"words": words, "origin": origin, "budget": budget,
+            "inputs": inputs, "engine": engine}
+
+
+def _is_int(v) -> bool:
+    return isinstance(v, int) and not isinstance(v, bool)     # JSON true 는 1 이 아니다
+
+
+def failed_result(error: str) -> dict:
+    """Result payload for a job that did not run; same keys as `_execute()`."""
+    return {"steps": 0, "halted": False, "error": error, "output": "",
+            "registers": None, "elapsed": 0.0}
+
+
+# ─────────────────────────── server side ─────────────────────────────
+class Job:
+    __slots__ = ("id", "spec", "submitted", "events")
+
+    def __init__(self, job_id, spec):
+        self.id = job_id
+        self.spec = spec
+        self.submitted = time.perf_counter()
+        self.events = asyncio.Queue()      # 마지막 이벤트는 항상 "result"
+
+    async def stream(self):
+        """Yield this job's events until (and including) the result."""
+        while True:
+            event = await self.events.get()
+            yield event
+            if event["event"] == "result":
+                return
+
+
+class QueueFull(Exception):
+    pass
+
+
+class JobService:
+    def __init__(self, workers: int = None, queue_size: int = 64,
+                 submit_timeout: float = 5.0, progress_every: int = 100_000):
+        self.workers = workers or os.cpu_count() or 1
+        self.queue_size = queue_size
+        self.submit_timeout = submit_timeout
+        self.progress_every = progress_every
+        self.queue = None
+        self.pool = None
+        self.server = None
+        self.address = None
+        self._jobs = {}
+        self._next_id = 1
+        self._tasks = []
+        self._progress = None
+        self._reader = None
+        # 통계
+        self.started_at = None
+        self.submitted = self.completed = self.failed = self.rejected = 0
+        self.running = 0
+        self.instructions = 0
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+
+    # ─────────────────────── lifecycle ───────────────────────────────
+    async def start(self, host: str = "127.0.0.1", port: int = 0, path: str = None):
+        """Warm the worker pool, then listen on TCP `host:port` or Unix socket `path`."""
+        loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(self.queue_size)
+        self._progress = multiprocessing.Queue()
+        self.pool = ProcessPoolExecutor(self.workers, initializer=_init_worker,
+                                        initargs=(self._progress,))
+        # 모든 worker 를 미리 띄우고 import 를 끝내 둔다 (첫 작업 지연 제거)
+        await asyncio.gather(*(loop.run_in_executor(self.pool, _warm)
+                               for _ in range(self.workers)))
+        self._reader = threading.Thread(target=self._drain_progress, args=(loop,),
+                                        daemon=True)
+        self._reader.start()
+        self._tasks = [asyncio.create_task(self._dispatch()) for _ in range(self.workers)]
+        if path is not None:
+            self.server = await asyncio.start_unix_server(self._handle, path)
+            self.address = path
+        else:
+            self.server = await asyncio.start_server(self._handle, host, port)
+            self.address = self.server.sockets[0].getsockname()[:2]
+        self.started_at = time.perf_counter()
+        return self.address
+
+    async def stop(self) -> None:
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        for t in self._tasks:
+            t.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        if self._reader is not None:
+            self._progress.put(None)
+            self._reader.join()
+        if self.pool is not None:
+            self.pool.shutdown(cancel_futures=True)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.stop()
+
+    # ─────────────────────── jobs ────────────────────────────────────
+    async def submit(self, spec: dict) -> Job:
+        """Validate and enqueue; raises ValueError or QueueFull."""
+        job = Job(self._next_id, validate(spec))
+        self._next_id += 1
+        self._jobs[job.id] = job
+        job.events.put_nowait({"event": "queued", "id": job.id,
+                               "position": self.queue.qsize() + 1})
+        try:
+            await asyncio.wait_for(self.queue.put(job), self.submit_timeout)
+        except asyncio.TimeoutError:
+            del self._jobs[job.id]
+            self.rejected += 1
+            raise QueueFull(f"queue full ({self.queue_size} jobs)") from None
+        self.submitted += 1
+        return job
+
+    async def _dispatch(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            job = await self.queue.get()
+            self.running += 1
+            job.events.put_nowait({"event": "started", "id": job.id})
+            try:
+                result = await loop.run_in_executor(self.pool, _execute, job.id,
+                                                    job.spec, self.progress_every)
+                self.completed += 1
+                self.instructions += result["steps"]
+            except Exception as e:          # worker crash 등: 작업만 실패 처리
+                result = failed_result(f"{type(e).__name__}: {e}")
+                self.failed += 1
+            finally:
+                self.running -= 1
+                self.queue.task_done()
+            self.latencies.append(time.perf_counter() - job.submitted)
+            self._jobs.pop(job.id, None)
+            job.events.put_nowait({"event": "result", "id": job.id, **result})
+
+    def _drain_progress(self, loop) -> None:
+        while True:
+            item = self._progress.get()
+            if item is None:
+                return
+            loop.call_soon_threadsafe(self._on_progress, *item)
+
+    def _on_progress(self, job_id: int, steps: int) -> None:
+        job = self._jobs.get(job_id)
+        if job is not None:
+            job.events.put_nowait({"event": "progress", "id": job_id, "steps": steps})
+
+    # ─────────────────────── stats ───────────────────────────────────
+    def stats(self) -> dict:
+        uptime = time.perf_counter() - self.started_at if self.started_at else 0.0
+        lat = sorted(self.latencies)
+
+        def pct(p):
+            return lat[min(len(lat) - 1, int(p / 100 * len(lat)))] if lat else None
+        return {
+            "queue_depth": self.queue.qsize() if self.queue else 0,
+            "queue_size": self.queue_size,
+            "running": self.running,
+            "workers": self.workers,
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "uptime": uptime,
+            "jobs_per_sec": self.completed / uptime if uptime else 0.0,
+            "instructions_per_sec": self.instructions / uptime if uptime else 0.0,
+            "latency": {"p50": pct(50), "p90": pct(90), "p99": pct(99)},
+        }
+
+    # ─────────────────────── HTTP ────────────────────────────────────
+    async def _handle(self, reader, writer) -> None:
+        try:
+            method, target, body = await _read_request(reader)
+        except (ValueError, asyncio.IncompleteReadError) as e:
+            await _respond(writer, 400, {"error": str(e)})
+            return
+        if method == "GET" and target == "/health":
+            await _respond(writer, 200, {"ok": True})
+        elif method == "GET" and target == "/stats":
+            await _respond(writer, 200, self.stats())
+        elif method == "POST" and target == "/jobs":
+            try:
+                job = await self.submit(json.loads(body or b"null"))
+            except (ValueError, json.JSONDecodeError) as e:
+                await _respond(writer, 400, {"error": str(e)})
+                return
+            except QueueFull as e:
+                await _respond(writer, 503, {"error": str(e)})
+                return
+            writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: application/x-ndjson\r\n"
+                         b"Connection: close\r\n\r\n")
+            try:
+                async for event in job.stream():
+                    writer.write(json.dumps(event).encode() + b"\n")
+                    await writer.drain()
+            except ConnectionError:
+                pass                        # 클라이언트가 끊어도 작업은 끝까지 수행
+            finally:
+                writer.close()
+        else:
+            await _respond(writer, 404, {"error": f"no route for {method} {target}"})
+
+
+async def _read_request(reader):
+    line = await reader.readline()
+    parts = line.decode("latin-1").split()
+    if len(parts) != 3:
+        raise ValueError("malformed request line")
+    method, target, _ = parts
+    length = 0
+    while True:
+        h = await reader.readline()
+        if h in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = h.decode("latin-1").partition(":")
+        if name.strip().lower() == "content-length":
+            length = int(value)
+    if length > MAX_BODY:
+        raise ValueError("request body too large")
+    body = await reader.readexactly(length) if length else b""
+    return method, target.split("?", 1)[0], body
+
+
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 503: "Service Unavailable"}
+
+
+async def _respond(writer, status: int, payload) -> None:
+    body = json.dumps(payload).encode()
+    writer.write(f"HTTP/1.1 {status} {_REASONS[status]}\r\n"
+                 f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n"
+                 f"Connection: close\r\n\r\n".encode() + body)
+    try:
+        await writer.drain()
+    finally:
+        writer.close()
+
+
+def main(argv=None):
+    import argparse
+    ap = argparse.ArgumentParser(prog="python -m cpu.service",
+                                 description="Batch LC-3 simulation service.")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--unix", metavar="PATH", help="listen on a Unix socket instead")
+    ap.add_argument("--workers", type=int, default=None)
+    ap.add_argument("--queue-size", type=int, default=64)
+    args = ap.parse_args(argv)
+
+    async def serve():
+        service = JobService(args.workers, args.queue_size)
+        async with service:
+            addr = await service.start(args.host, args.port, args.unix)
+            print(f"listening on {addr} with {service.workers} workers", flush=True)
+            await asyncio.Event().wait()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
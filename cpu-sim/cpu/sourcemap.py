@@ -0,0 +1,54 @@
+"""Source maps: which source line produced the word at each address.
+
+Stored as two pairs of parallel arrays, one sorted by address and one by
+line, so both directions are a `bisect` (O(log n)) and cheap enough to run
+on every GUI refresh or error report:
+
+    smap = SourceMap([(1, 0x3000), (3, 0x3001)], "echo.asm")
+    smap.line_for(0x3001)       # 3
+    smap.addresses_for(1)       # [0x3000]
+    smap.location(0x3001)       # "echo.asm:3"
+
+Set `cpu.source_map` to have the runner report runtime errors as file:line.
+"""
+from array import array
+from bisect import bisect_left, bisect_right
+
+
+class SourceMap:
+    __slots__ = ("filename", "addrs", "lines", "_by_line", "_line_addrs")
+
+    def __init__(self, pairs, filename: str = "<input>"):
+        """`pairs` are `(line_no, address)`, e.g. `Assembly.lines`."""
+        pairs = list(pairs)
+        self.filename = filename
+        by_addr = sorted(pairs, key=lambda p: p[1])
+        self.addrs = array("H", [a for _, a in by_addr])    # 주소 오름차순
+        self.lines = array("I", [n for n, _ in by_addr])
+        by_line = sorted(pairs)
+        self._by_line = array("I", [n for n, _ in by_line])  # 줄 번호 오름차순
+        self._line_addrs = array("H", [a for _, a in by_line])
+
+    def __len__(self) -> int:
+        return len(self.addrs)
+
+    def line_for(self, addr: int):
+        """Source line (1-based) of the word at `addr`, or None if not from this source."""
+        i = bisect_left(self.addrs, addr)
+        if i < len(self.addrs) and self.addrs[i] == addr:
+            return self.lines[i]
+        return None
+
+    def addresses_for(self, line: int) -> list:
+        """Addresses assembled from source `line` (empty for comments / labels only)."""
+        lo = bisect_left(self._by_line, line)
+        hi = bisect_right(self._by_line, line, lo)
+        return list(self._line_addrs[lo:hi])
+
+    def location(self, addr: int):
+        """`"file:line"` for `addr`, or None."""
+        line = self.line_for(addr)
+        return None if line is None else f"{self.filename}:{line}"
+
+    def __repr__(self) -> str:
+        return f"SourceMap({self.filename!r}, {len(self)} addresses)"
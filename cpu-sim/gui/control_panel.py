@@ -1,9 +1,12 @@
-from PySide6.QtWidgets import QWidget, QPushButton, QHBoxLayout, QLabel
+from PySide6.QtWidgets import (QWidget, QPushButton, QHBoxLayout, QLabel,
+                               QFileDialog, QMessageBox)
 from PySide6.QtCore import QTimer
 
+STATE_FILTER = "LC-3 save states (*.lc3s);;All files (*)"
+
 class ControlPanel(QWidget):
     """
-    Step / Run / Pause / Reset 버튼과 상태 레이블.
+    Step / Run / Pause / Reset / Save·Load State 버튼과 상태 레이블.
     Run 시 QTimer 로 CPU.step() 을 고속 호출.
     """
     def __init__(self, cpu, mem_view, parent=None):
@@ -15,11 +18,13 @@ class ControlPanel(QWidget):
         self.btn_run   = QPushButton("Run")
         self.btn_pause = QPushButton("Pause")
         self.btn_reset = QPushButton("Reset")
+        self.btn_save  = QPushButton("Save State")
+        self.btn_load  = QPushButton("Load State")
         self.status    = QLabel("Stopped")
 
         lay = QHBoxLayout(self)
-        for b in (self.btn_step, self.btn_run,
-                  self.btn_pause, self.btn_reset, self.status):
+        for b in (self.btn_step, self.btn_run, self.btn_pause, self.btn_reset,
+                  self.btn_save, self.btn_load, self.status):
             lay.addWidget(b)
 
         # connections
@@ -27,6 +32,8 @@ class ControlPanel(QWidget):
         self.btn_run.clicked.connect(self.run)
         self.btn_pause.clicked.connect(self.pause)
         self.btn_reset.clicked.connect(self.reset)
+        self.btn_save.clicked.connect(self.save_state)
+        self.btn_load.clicked.connect(self.load_state)
 
         # timer for continuous run
         self.timer = QTimer(self)
@@ -36,11 +43,16 @@ class ControlPanel(QWidget):
     def step_once(self):
         if not self.cpu.running:
             self.status.setText("Stopped")
+        smap = self.cpu.source_map
         try:
             self.cpu.step()
-            self.status.setText(f"PC={self.cpu.reg.pc:02X}")
+            line = smap.line_for(self.cpu.reg.pc) if smap is not None else None
+            self.status.setText(f"PC=x{self.cpu.reg.pc:04X}"
+                                + (f" (line {line})" if line is not None else ""))
         except RuntimeError as e:
-            self.status.setText(str(e))
+            # 실패한 명령은 fetch 로 PC 가 이미 증가한 뒤이므로 PC-1
+            loc = smap.location((self.cpu.reg.pc - 1) & 0xFFFF) if smap is not None else None
+            self.status.setText(f"{loc}: {e}" if loc else str(e))
 
     def run(self):
         self.cpu.running = True
@@ -54,5 +66,31 @@ class ControlPanel(QWidget):
 
     def reset(self):
         self.cpu.reset()
+        self.mem_view.reset_coverage()  # 메모리가 지워졌으니 실행 기록도 새로 시작
         self.mem_view.refresh()
         self.status.setText("Reset OK")
+
+    def save_state(self):
+        path, _ = QFileDialog.getSaveFileName(self, "Save State", "", STATE_FILTER)
+        if not path:
+            return
+        try:
+            size = self.cpu.save_state(path)
+        except OSError as e:
+            QMessageBox.warning(self, "Save State", str(e))
+            return
+        self.status.setText(f"Saved {size} bytes")
+
+    def load_state(self):
+        path, _ = QFileDialog.getOpenFileName(self, "Load State", "", STATE_FILTER)
+        if not path:
+            return
+        self.timer.stop()               # 실행 중이던 타이머가 새 상태를 바로 진행하지 않도록
+        try:
+            self.cpu.load_state(path)
+        except (OSError, ValueError) as e:
+            QMessageBox.warning(self, "Load State", str(e))
+            return
+        self.mem_view.reset_coverage()  # 저장 파일에는 실행 기록이 없다
+        self.mem_view.refresh()
+        self.status.setText(f"Loaded, PC=x{self.cpu.reg.pc:04X}")
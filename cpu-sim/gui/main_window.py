@@ -5,12 +5,14 @@ from .register_panel import RegisterPanel
 from .memory_panel import MemoryPanel
 from .control_panel import ControlPanel
 from cpu.cpu_core import CPU
+from cpu.coverage import Coverage
 import sys
 
 class MainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
         self.cpu = CPU()
+        self.cpu.coverage = Coverage()   # 메모리 패널의 미실행 코드 표시용
         self.setWindowTitle("Educational CPU Simulator")
 
         # 중앙 위젯: 메모리
@@ -1,17 +1,30 @@
 from PySide6.QtCore import QAbstractTableModel, Qt, QModelIndex, QTimer
+from PySide6.QtGui import QColor, QTextCharFormat, QTextCursor, QTextFormat
 from PySide6.QtWidgets import (QTableView, QWidget, QVBoxLayout, QLabel, QHBoxLayout, 
-                              QPushButton, QInputDialog, QMessageBox, QTextEdit, QGroupBox)
-import re
+                              QPushButton, QInputDialog, QMessageBox, QTextEdit, QGroupBox,
+                              QLineEdit, QCheckBox, QHeaderView, QAbstractItemView)
+from cpu.assembler import assemble, assemble_instruction
+from cpu.coverage import Coverage, coverage_report
+from cpu.memory import MEM_SIZE
+
+COVERED   = QColor(200, 240, 200)   # 실행된 코드
+UNCOVERED = QColor(250, 200, 200)   # 한 번도 실행되지 않은 코드
+PC_ROW    = QColor(255, 240, 160)   # 현재 PC
 
 class MemoryModel(QAbstractTableModel):
-    """256 바이트 메모리를 1 열 테이블로 노출. 편집 가능."""
+    """
+    64K 워드 메모리 전체를 1 열 테이블로 노출. 편집 가능.
+    행마다 저장하는 상태가 없으므로 (모두 data() 에서 cpu 를 직접 읽음)
+    보이는 행만 그려지고, 새로고침도 보이는 범위의 dataChanged 로 충분하다.
+    """
     def __init__(self, cpu, parent=None):
         super().__init__(parent)
         self.cpu = cpu
+        self.code = set()   # 마지막으로 어셈블한 명령어 주소 (커버리지 표시용)
 
     # 필수 구현
     def rowCount(self, parent=QModelIndex()):
-        return 256
+        return MEM_SIZE
 
     def columnCount(self, parent=QModelIndex()):
         return 1
@@ -20,15 +33,21 @@ class MemoryModel(QAbstractTableModel):
         if not index.isValid():
             return None
         if role in (Qt.DisplayRole, Qt.EditRole):
-            val = self.cpu.mem.read(index.row())
+            val = self.cpu.mem.peek(index.row())   # 표시만: KBDR 등 장치 read 부작용 없이
             return f"{val:04X}"  # 16-bit values (4 hex digits)
+        if role == Qt.BackgroundRole:
+            if index.row() == self.cpu.reg.pc:
+                return PC_ROW
+            cov = self.cpu.coverage
+            if cov is not None and index.row() in self.code:
+                return COVERED if cov.covered(index.row()) else UNCOVERED
         return None
 
     def headerData(self, section, orientation, role):
         if role != Qt.DisplayRole:
             return None
         if orientation == Qt.Vertical:
-            return f"{section:02X}"
+            return f"x{section:04X}"
         return "Value"
 
     # 편집 허용
@@ -63,10 +82,37 @@ class MemoryPanel(QWidget):
         self.table_view = QTableView(self)
         self.table_view.setModel(MemoryModel(cpu, self))
         self.table_view.setSelectionBehavior(QTableView.SelectRows)
+        # 65536 행: 고정 행 높이로 두어야 행 크기를 하나씩 계산하지 않는다
+        self.table_view.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
         self.table_view.verticalHeader().setDefaultSectionSize(20)
         self.table_view.horizontalHeader().setStretchLastSection(True)
         layout.addWidget(self.table_view)
         
+        # Search / jump controls
+        nav_layout = QHBoxLayout()
+        
+        # Search: hex words ("1234 ABCD"), "text" (one char per word) or bytes: DE AD
+        self.search_edit = QLineEdit()
+        self.search_edit.setPlaceholderText('Find: 1234 ABCD | "text" | bytes: DE AD')
+        self.search_edit.returnPressed.connect(self.find_next)
+        nav_layout.addWidget(self.search_edit)
+        
+        self.btn_find = QPushButton("Find Next")
+        self.btn_find.clicked.connect(self.find_next)
+        nav_layout.addWidget(self.btn_find)
+        
+        # Jump to an address (x3000 / 0x3000 / 3000) or an assembled label
+        self.goto_edit = QLineEdit()
+        self.goto_edit.setPlaceholderText("Go to address or label")
+        self.goto_edit.returnPressed.connect(self.goto)
+        nav_layout.addWidget(self.goto_edit)
+        
+        # Keep the PC row in view while running
+        self.chk_follow = QCheckBox("Follow PC")
+        nav_layout.addWidget(self.chk_follow)
+        
+        layout.addLayout(nav_layout)
+        
         # Memory edit controls
         edit_layout = QHBoxLayout()
         
@@ -96,7 +142,8 @@ class MemoryPanel(QWidget):
             "• LDR / STR  DR|SR, BaseR, #off6\n"
             "• LEA  DR, #off9               ; 주소 계산\n"
             "• TRAP x23 / x25 …            ; 시스템 호출\n"
-            "※ LABEL 은 아직 지원하지 않으며, #offset 숫자(10진/16진 0x…)만 가능\n"
+            "• LABEL 명령 / LABEL:           ; 라벨 정의 (PC-상대 operand 에 사용)\n"
+            "※ 숫자는 #offset (10진/16진 0x…)\n"
         )
         help_label = QLabel(help_text)
         asm_layout.addWidget(help_label)
@@ -119,33 +166,136 @@ class MemoryPanel(QWidget):
         self.btn_assemble.clicked.connect(self.assemble_and_load)
         asm_controls.addWidget(self.btn_assemble)
         
+        # Coverage report for the assembled program
+        self.btn_coverage = QPushButton("Coverage Report")
+        self.btn_coverage.clicked.connect(self.show_coverage)
+        asm_controls.addWidget(self.btn_coverage)
+        
         asm_layout.addLayout(asm_controls)
         asm_group.setLayout(asm_layout)
         layout.addWidget(asm_group)
         
         # Current start address for assembly
         self.start_address = 0
+        self.assembly = None
+        self.last_found = None   # Find Next 는 여기 다음부터 검색
+        self.current_line = None # 강조 중인 소스 줄 (PC 위치)
         
         # 주기적 새로고침
         self.timer = QTimer(self)
         self.timer.timeout.connect(self.refresh)
         self.timer.start(500)  # ms
     
+    def reset_coverage(self):
+        """Start a fresh coverage bitmap (no-op when coverage is not collected)"""
+        if self.cpu.coverage is not None:
+            self.cpu.coverage = Coverage()
+    
     def refresh(self):
-        """Refresh the memory view"""
-        self.table_view.model().layoutChanged.emit()
+        """Repaint the visible rows (the model itself is never reset)"""
+        view = self.table_view
+        model = view.model()
+        if self.chk_follow.isChecked():
+            pc_index = model.index(self.cpu.reg.pc, 0)
+            view.scrollTo(pc_index, QAbstractItemView.EnsureVisible)
+        top = view.rowAt(0)
+        bottom = view.rowAt(view.viewport().height() - 1)
+        if top < 0:
+            return
+        if bottom < 0:
+            bottom = MEM_SIZE - 1
+        model.dataChanged.emit(model.index(top, 0), model.index(bottom, 0),
+                               [Qt.DisplayRole, Qt.BackgroundRole])
+        self.highlight_source_line()
+    
+    def highlight_source_line(self):
+        """Highlight the source line of the instruction at PC (bisect lookup in the source map)"""
+        smap = self.cpu.source_map
+        line = smap.line_for(self.cpu.reg.pc) if smap is not None else None
+        if line == self.current_line:
+            return
+        self.current_line = line
+        selections = []
+        if line is not None:
+            fmt = QTextCharFormat()
+            fmt.setBackground(PC_ROW)
+            fmt.setProperty(QTextFormat.FullWidthSelection, True)
+            sel = QTextEdit.ExtraSelection()
+            sel.format = fmt
+            sel.cursor = QTextCursor(self.asm_text.document().findBlockByNumber(line - 1))
+            selections.append(sel)
+        self.asm_text.setExtraSelections(selections)
+    
+    def parse_address(self, text):
+        """'x3000' / '0x3000' / '3000' (hex) or a label of the last assembly → address"""
+        text = text.strip()
+        if self.assembly is not None and text in self.assembly.symbols:
+            return self.assembly.symbols[text]
+        digits = text[1:] if text[:1] in "xX" else text
+        value = int(digits, 16)           # ValueError for anything else
+        if not 0 <= value < MEM_SIZE:
+            raise ValueError(f"address {text} out of range")
+        return value
+    
+    def show_address(self, addr):
+        """Scroll to and select the row of `addr`"""
+        index = self.table_view.model().index(addr, 0)
+        self.table_view.scrollTo(index, QAbstractItemView.PositionAtCenter)
+        self.table_view.setCurrentIndex(index)
+    
+    def goto(self):
+        """Jump to the address or label typed in the Go-to box"""
+        try:
+            addr = self.parse_address(self.goto_edit.text())
+        except ValueError:
+            QMessageBox.warning(self, "Go To", 
+                               f"Not an address or known label: {self.goto_edit.text()}")
+            return
+        self.show_address(addr)
+    
+    @staticmethod
+    def parse_pattern(text):
+        """Search box text → pattern for Memory.find (words, or bytes for 'bytes:')"""
+        text = text.strip()
+        if text.lower().startswith("bytes:"):
+            return bytes(int(tok, 16) for tok in text[6:].split())
+        if len(text) >= 2 and text[0] == text[-1] == '"':
+            return [ord(ch) for ch in text[1:-1]]      # .STRINGZ 처럼 한 워드에 한 글자
+        return [int(tok[1:] if tok[:1] in "xX" else tok, 16) for tok in text.split()]
+    
+    def find_next(self):
+        """Find the search pattern after the last match (bulk search over all memory)"""
+        try:
+            pattern = self.parse_pattern(self.search_edit.text())
+            if any(not 0 <= v <= 0xFFFF for v in pattern):
+                raise ValueError("value out of range")
+        except ValueError as e:
+            QMessageBox.warning(self, "Find", f"Invalid search pattern: {e}")
+            return
+        start = 0 if self.last_found is None else self.last_found + 1
+        addr = self.cpu.mem.find(pattern, start)
+        if addr is None:
+            QMessageBox.information(self, "Find", "Pattern not found.")
+            return
+        self.last_found = addr
+        self.show_address(addr)
     
     def edit_address(self):
         """Edit a specific memory address"""
-        addr, ok1 = QInputDialog.getInt(self, "Edit Memory", 
-                                      "Enter memory address (0-255):",
-                                      0, 0, 255)
+        text, ok1 = QInputDialog.getText(self, "Edit Memory", 
+                                         "Enter memory address (x0000-xFFFF or label):")
         if not ok1:
             return
+        try:
+            addr = self.parse_address(text)
+        except ValueError:
+            QMessageBox.warning(self, "Invalid Input", 
+                               "Please enter a hexadecimal address or a known label.")
+            return
             
-        current_val = self.cpu.mem.read(addr)
+        current_val = self.cpu.mem.peek(addr)
         value_str, ok2 = QInputDialog.getText(self, "Edit Memory", 
-                                           f"Enter new value for address {addr:02X} (hex):",
+                                           f"Enter new value for address x{addr:04X} (hex):",
                                            text=f"{current_val:04X}")  # 16-bit values (4 hex digits)
         if ok2:
             try:
@@ -159,11 +309,16 @@ class MemoryPanel(QWidget):
     
     def set_start_address(self):
         """Set the start address for assembly code"""
-        addr, ok = QInputDialog.getInt(self, "Assembly Start Address", 
-                                     "Enter start address for assembly (0-255):",
-                                     self.start_address, 0, 255)
-        if ok:
-            self.start_address = addr
+        text, ok = QInputDialog.getText(self, "Assembly Start Address", 
+                                        "Enter start address for assembly (x0000-xFFFF):",
+                                        text=f"x{self.start_address:04X}")
+        if not ok:
+            return
+        try:
+            self.start_address = self.parse_address(text)
+        except ValueError:
+            QMessageBox.warning(self, "Invalid Input", 
+                               "Please enter a hexadecimal address.")
     
     def assemble_and_load(self):
         """Assemble the code in the text box and load it into memory"""
@@ -172,149 +327,34 @@ class MemoryPanel(QWidget):
             QMessageBox.warning(self, "Empty Input", "Please enter assembly code.")
             return
         
-        lines = asm_text.split('\n')
-        addr = self.start_address
-        errors = []
-        
-        for i, line in enumerate(lines):
-            line = line.strip()
-            if not line or line.startswith(';'):  # Skip empty lines and comments
-                continue
-            
-            try:
-                # Parse the instruction
-                instr_bytes = self.assemble_instruction(line)
-                
-                # Write to memory
-                for b in instr_bytes:
-                    if addr > 255:
-                        errors.append(f"Line {i+1}: Memory overflow at address {addr}")
-                        break
-                    self.cpu.mem.write(addr, b)
-                    addr += 1
-            except ValueError as e:
-                errors.append(f"Line {i+1}: {str(e)}")
+        asm = assemble(self.asm_text.toPlainText(), self.start_address, "<editor>")
+        for i, word in enumerate(asm.words):
+            self.cpu.mem.write(asm.origin + i, word)
+        self.assembly = asm
+        self.cpu.source_map = asm.source_map
+        self.reset_coverage()           # 이전 프로그램의 실행 기록이 새 코드에 남지 않도록
+        self.current_line = None
+        self.table_view.model().code = {addr for _, addr in asm.lines}
         
         self.refresh()
         
-        if errors:
+        if asm.errors:
             QMessageBox.warning(self, "Assembly Errors", 
-                               "The following errors occurred:\n" + "\n".join(errors))
+                               "The following errors occurred:\n" + "\n".join(asm.errors))
         else:
             QMessageBox.information(self, "Assembly Complete", 
-                                   f"Code assembled and loaded starting at address {self.start_address:02X}")
+                                   f"Code assembled and loaded starting at address x{self.start_address:04X}")
     
-    def assemble_instruction(self, line: str):
-        """
-        단일 LC-3 어셈블리 라인을 16-bit 워드 리스트로 변환.
-        ▸ 라벨 파서는 생략하고, #imm / #off 숫자만 허용.
-        ▸ 모든 숫자는 10진 또는 0xHEX 인식.
-        ▸ 잘못된 형식이면 ValueError 발생.
-        """
-        # 코멘트 제거
-        line = re.sub(r';.*$', '', line).strip()
-        if not line:
-            raise ValueError("empty")
-
-        # 공통 유틸
-        def num(tok, bits, signed=True):
-            """토큰 → int, 범위 검사(+sign extend를 기계가 하므로 여기선 값만 확인)"""
-            base = 16 if tok.lower().startswith('0x') else 10
-            v = int(tok, base)
-            lo = -(1 << (bits-1)) if signed else 0
-            hi =  (1 << (bits-1)) - 1 if signed else (1 << bits) - 1
-            if not lo <= v <= hi:
-                raise ValueError(f"immediate {tok} out of range for {bits}-bit field")
-            return v & ((1 << bits) - 1)
-
-        # -------- ADD / AND (두 형식) ---------------------------------
-        m = re.match(r'(ADD|AND)\s+R(\d),\s*R(\d),\s*(R(\d)|#(-?\w+))$', line, re.I)
-        if m:
-            op, dr, sr1, last, sr2, imm = m.groups()
-            opcode = 0x1 if op.upper() == 'ADD' else 0x5
-            dr = int(dr); sr1 = int(sr1)
-            if sr2:                          # 레지스터 형식
-                sr2 = int(sr2)
-                instr = (opcode << 12) | (dr << 9) | (sr1 << 6) | sr2
-            else:                            # 즉시 형식
-                imm5 = num(imm, 5)
-                instr = (opcode << 12) | (dr << 9) | (sr1 << 6) | (1 << 5) | imm5
-            return [instr]
-
-        # -------- NOT --------------------------------------------------
-        m = re.match(r'NOT\s+R(\d),\s*R(\d)$', line, re.I)
-        if m:
-            dr, sr = map(int, m.groups())
-            instr = (0x9 << 12) | (dr << 9) | (sr << 6) | 0x3F
-            return [instr]
-
-        # -------- BR ---------------------------------------------------
-        m = re.match(r'BR([nNpPzZ]{0,3})\s+#(-?\w+)$', line)
-        if m:
-            cond, off = m.groups()
-            nzp = 0
-            nzp |= 0b100 if 'n' in cond.lower() else 0
-            nzp |= 0b010 if 'z' in cond.lower() else 0
-            nzp |= 0b001 if 'p' in cond.lower() else 0
-            if nzp == 0: nzp = 0b111                  # plain “BR”
-            off9 = num(off, 9)
-            instr = (0x0 << 12) | (nzp << 9) | off9
-            return [instr]
-
-        # -------- JMP / RET -------------------------------------------
-        if re.fullmatch(r'RET', line, re.I):
-            return [(0xC << 12) | (7 << 6)]
-        m = re.match(r'JMP\s+R(\d)$', line, re.I)
-        if m:
-            baser = int(m.group(1))
-            return [(0xC << 12) | (baser << 6)]
-
-        # -------- JSR / JSRR ------------------------------------------
-        m = re.match(r'JSRR\s+R(\d)$', line, re.I)
-        if m:
-            baser = int(m.group(1))
-            instr = (0x4 << 12) | (0 << 11) | (0 << 9) | (baser << 6)
-            return [instr]
-        m = re.match(r'JSR\s+#(-?\w+)$', line, re.I)
-        if m:
-            off11 = num(m.group(1), 11)
-            instr = (0x4 << 12) | (1 << 11) | off11
-            return [instr]
-
-        # -------- LD / LDI / ST / STI (PC-offset9) --------------------
-        for mnemonic, opc in [('LD',0x2), ('LDI',0xA), ('ST',0x3), ('STI',0xB)]:
-            m = re.match(fr'{mnemonic}\s+R?(\d),\s*#(-?\w+)$', line, re.I)
-            if m:
-                reg, off = m.groups()
-                reg = int(reg)
-                off9 = num(off, 9)
-                instr = (opc << 12) | (reg << 9) | off9
-                return [instr]
-
-        # -------- LDR / STR (Base+off6) -------------------------------
-        for mnemonic, opc in [('LDR',0x6), ('STR',0x7)]:
-            m = re.match(fr'{mnemonic}\s+R(\d),\s*R(\d),\s*#(-?\w+)$', line, re.I)
-            if m:
-                drsr, baser, off = m.groups()
-                drsr  = int(drsr)
-                baser = int(baser)
-                off6  = num(off, 6)
-                instr = (opc << 12) | (drsr << 9) | (baser << 6) | off6
-                return [instr]
-
-        # -------- LEA --------------------------------------------------
-        m = re.match(r'LEA\s+R(\d),\s*#(-?\w+)$', line, re.I)
-        if m:
-            dr, off = m.groups()
-            dr = int(dr); off9 = num(off, 9, signed=True)
-            instr = (0xE << 12) | (dr << 9) | off9
-            return [instr]
-
-        # -------- TRAP -------------------------------------------------
-        m = re.match(r'TRAP\s+x([0-9A-F]{1,2})$', line, re.I)
-        if m:
-            vect = int(m.group(1), 16) & 0xFF
-            instr = (0xF << 12) | vect
-            return [instr]
-
-        raise ValueError("syntax error or unsupported opcode")
+    def show_coverage(self):
+        """Show executed / never-executed source lines of the last assembly"""
+        if self.assembly is None or self.cpu.coverage is None:
+            QMessageBox.information(self, "Coverage", "Assemble and run a program first.")
+            return
+        report = coverage_report(self.cpu.coverage, self.asm_text.toPlainText(),
+                                 self.assembly)
+        box = QMessageBox(QMessageBox.Information, "Coverage", report.splitlines()[-1], 
+                          parent=self)
+        box.setDetailedText(report)
+        box.exec()
+    
+    assemble_instruction = staticmethod(assemble_instruction)
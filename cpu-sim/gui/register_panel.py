@@ -1,10 +1,10 @@
 from PySide6.QtWidgets import QWidget, QLabel, QLineEdit, QGridLayout, QMessageBox
 from PySide6.QtCore import Qt, QTimer, Slot
-from cpu.registers import GENERAL_REGS, SPECIAL_REGS
+from cpu.registers import GENERAL_REGS, SPECIAL_REGS, SPECIAL_ATTRS
 
 class RegisterPanel(QWidget):
     """
-    8 개 GPR + 4 개 특수 레지스터를 그리드로 표시.
+    8 개 GPR + 특수 레지스터(PC, IR, CPSR, SSP, USP, LR)를 그리드로 표시.
     200 ms 간격 QTimer 로 값 반영.
     레지스터 값 직접 수정, 상수 로드, 메모리 로드/저장 기능 추가.
     """
@@ -54,10 +54,8 @@ class RegisterPanel(QWidget):
         for i in range(GENERAL_REGS):
             self.edits[i].setText(f"{self.cpu.reg[i]:04X}")  # 16-bit values (4 hex digits)
         # 특수
-        special_start = GENERAL_REGS
-        self.edits[special_start].setText(f"{self.cpu.reg.pc:04X}")
-        self.edits[special_start+1].setText(f"{self.cpu.reg.ir:04X}")
-        self.edits[special_start+2].setText(f"{self.cpu.reg.cpsr:04X}")
+        for row, attr in enumerate(SPECIAL_ATTRS, GENERAL_REGS):
+            self.edits[row].setText(f"{getattr(self.cpu.reg, attr):04X}")
         self.updating = False
     
     @Slot()
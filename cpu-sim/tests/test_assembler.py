@@ -0,0 +1,50 @@
+from cpu.assembler import assemble, assemble_instruction
+
+
+def test_single_instructions():
+    assert assemble_instruction("ADD R1, R1, #-1") == [0x127F]
+    assert assemble_instruction("BRp #-2") == [0x03FE]
+    assert assemble_instruction("TRAP x25") == [0xF025]
+
+
+def test_assemble_tracks_line_addresses_and_errors():
+    src = "; counter\nAND R0, R0, #0\n\nADD R0, R0, #5\nBOGUS\nBRp #-2\n"
+    asm = assemble(src, 0x3000)
+    assert asm.words == [0x5020, 0x1025, 0x03FE]
+    assert asm.lines == [(2, 0x3000), (4, 0x3001), (6, 0x3002)]
+    assert asm.errors == ["Line 5: syntax error or unsupported opcode"]
+
+
+def test_labels_resolve_to_pc_relative_offsets():
+    src = ("        LD  R1, COUNT\n"
+           "LOOP:   ; decrement until zero\n"
+           "        ADD R1, R1, #-1\n"
+           "        BRp LOOP\n"
+           "DONE    BRnzp DONE\n"
+           "COUNT   ADD R0, R0, #5\n")
+    asm = assemble(src, 0x3000)
+    assert asm.errors == []
+    assert asm.symbols == {"LOOP": 0x3001, "DONE": 0x3003, "COUNT": 0x3004}
+    assert asm.words == [0x2203, 0x127F, 0x03FE, 0x0FFF, 0x1025]
+    assert asm.lines == [(1, 0x3000), (3, 0x3001), (4, 0x3002), (5, 0x3003), (6, 0x3004)]
+
+
+def test_label_errors():
+    asm = assemble("A: ADD R0, R0, #1\nA: BR MISSING\nBOGUS\n")
+    assert asm.errors == ["Line 2: duplicate label A",
+                          "Line 2: undefined label MISSING",
+                          "Line 3: syntax error or unsupported opcode"]
+
+
+def test_second_pass_errors_keep_later_addresses_aligned():
+    from cpu.coverage import Coverage, coverage_report
+    src = "ADD R0, R0, #1\nBR MISSING\nADD R1, R1, #1\nNOT R2, R2\nLD R3, FAR\nFAR: ADD R3, R3, #0"
+    asm = assemble(src, 0x3000)
+    assert asm.errors == ["Line 2: undefined label MISSING"]
+    assert asm.lines == [(1, 0x3000), (3, 0x3002), (4, 0x3003), (5, 0x3004), (6, 0x3005)]
+    assert asm.words == [0x1021, 0x0000, 0x1261, 0x94BF, 0x2600, 0x16E0]
+    assert asm.symbols["FAR"] == 0x3005
+    for no, addr in asm.lines:
+        assert asm.source_map.line_for(addr) == no
+    assert coverage_report(Coverage(), src, asm).endswith("0/5 instructions executed, "
+                                                           "0/0 branches taken both ways")
@@ -0,0 +1,55 @@
+from cpu.cache import ResultCache
+from cpu.cpu_core import CPU
+from cpu.runner import load_image, run
+
+# echo one character then HALT via MCR:
+#   LDI R0,KBDR ; STI R0,DDR ; AND R1,R1,#0 ; STI R1,MCR
+PROGRAM = [0xA004, 0xB004, 0x5260, 0xB203, 0x0000, 0xFE02, 0xFE06, 0xFFFE]
+
+
+def _cpu():
+    cpu = CPU()
+    load_image(cpu, PROGRAM, 0x3000)
+    return cpu
+
+
+def test_hit_restores_identical_state(tmp_path):
+    with ResultCache(tmp_path / "c.sqlite") as cache:
+        first = run(_cpu(), 100, inputs="q", cache=cache)
+        assert not first.stats["cache_hit"]
+        assert first.output == "q" and first.halted
+
+        cpu = _cpu()
+        again = run(cpu, 100, inputs="q", cache=cache, engine="predecoded")
+        assert not again.stats["cache_hit"]          # engine is part of the key
+
+        cpu = _cpu()
+        hit = run(cpu, 100, inputs="q", cache=cache)
+        assert hit.stats["cache_hit"]
+        assert (hit.steps, hit.halted, hit.output) == (first.steps, True, "q")
+        assert cpu.reg == first.cpu.reg
+        assert cpu.mem.mem == first.cpu.mem.mem
+        assert cache.hits == 1
+
+
+def test_key_covers_inputs_budget_and_memory():
+    cpu = _cpu()
+    eng = type("E", (), {"name": "e", "version": 1})
+    base = ResultCache.key(cpu, "q", 100, eng)
+    assert ResultCache.key(cpu, "r", 100, eng) != base
+    assert ResultCache.key(cpu, "q", 101, eng) != base
+    cpu.mem.write(0x4000, 1)
+    assert ResultCache.key(cpu, "q", 100, eng) != base
+
+
+def test_size_cap_evicts_least_recently_used(tmp_path):
+    with ResultCache(tmp_path / "c.sqlite") as cache:
+        for ch in "abc":
+            run(_cpu(), 100, inputs=ch, cache=cache)
+        one = cache.size() // 3
+        run(_cpu(), 100, inputs="a", cache=cache)    # touch "a"
+        cache.max_bytes = 2 * one + one // 2
+        run(_cpu(), 100, inputs="d", cache=cache)    # evicts "b" then "c"
+        assert len(cache) == 2
+        assert run(_cpu(), 100, inputs="a", cache=cache).stats["cache_hit"]
+        assert not run(_cpu(), 100, inputs="b", cache=cache).stats["cache_hit"]
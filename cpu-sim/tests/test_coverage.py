@@ -0,0 +1,61 @@
+from cpu.assembler import assemble
+from cpu.coverage import Coverage, BITMAP_BYTES, coverage_report
+from cpu.cpu_core import CPU
+from cpu.runner import load_image, run
+
+SOURCE = """AND R0, R0, #0
+ADD R0, R0, #2
+ADD R0, R0, #-1
+BRp #-2
+BRn #1
+NOT R1, R1
+"""
+
+
+def _covered(engine, source=SOURCE, steps=7):
+    asm = assemble(source, 0x3000)
+    cpu = CPU()
+    cpu.coverage = Coverage()
+    load_image(cpu, asm.words, 0x3000)
+    run(cpu, steps, engine=engine)
+    return cpu.coverage, asm
+
+
+def test_executed_and_branch_bits():
+    for engine in ("reference", "predecoded"):
+        cov, _ = _covered(engine)
+        assert [cov.covered(a) for a in range(0x3000, 0x3006)] == \
+            [True, True, True, True, True, False]
+        assert cov.branch(0x3003) == "both"
+        assert cov.branch(0x3004) == "not-taken"
+        assert cov.instructions() == 5
+        assert cov.branch_sites() == (2, 1)
+
+
+def test_merge_is_bitwise_or(tmp_path):
+    a, b = Coverage(), Coverage()
+    a.record(0x10, 0x1021, 0)
+    b.record(0x11, 0x0E01, 0x1)         # BRnzp, taken
+    b.save(tmp_path / "b.cov")
+    m = Coverage.merged([a, (tmp_path / "b.cov").read_bytes()])
+    assert m.covered(0x10) and m.covered(0x11)
+    assert m.branch(0x11) == "taken"
+    a |= b
+    assert a.to_bytes() == m.to_bytes()
+    assert len(a.executed) == BITMAP_BYTES == 8192
+
+
+def test_report_overlays_source_lines():
+    cov, asm = _covered("reference")
+    lines = coverage_report(cov, SOURCE, asm).splitlines()
+    assert lines[3].startswith("x3003 + both")
+    assert lines[4].startswith("x3004 + not-taken")
+    assert lines[5].startswith("x3005 - ")
+    assert lines[-1] == "5/6 instructions executed, 1/2 branches taken both ways"
+
+
+def test_reset_keeps_coverage():
+    cpu = CPU()
+    cpu.coverage = cov = Coverage()
+    cpu.reset()
+    assert cpu.coverage is cov
@@ -0,0 +1,43 @@
+from cpu.cpu_core import CPU
+
+
+def _run(words, steps, origin=0x0):
+    cpu = CPU()
+    for i, w in enumerate(words):
+        cpu.mem.write(origin + i, w)
+    cpu.reg.pc = origin
+    for _ in range(steps):
+        cpu.step()
+    return cpu
+
+
+def test_add_imm_wraps_16_bits():
+    # ADD R1,R1,#-1 from R1 == 0
+    cpu = _run([0x127F], 1)
+    assert cpu.reg[1] == 0xFFFF
+    assert cpu.reg.cpsr & 0x7 == 0x4          # N
+
+
+def test_not_and_setcc():
+    # NOT R2,R2 ; AND R3,R2,#0
+    cpu = _run([0x94BF, 0x56A0], 2)
+    assert cpu.reg[2] == 0xFFFF
+    assert cpu.reg[3] == 0
+    assert cpu.reg.cpsr & 0x7 == 0x2          # Z
+
+
+def test_trap_from_user_mode_switches_stack():
+    cpu = CPU()
+    cpu.mem.write(0x10, 0x20)                 # trap vector x10 → x20
+    cpu.mem.write(0x30, 0xF010)               # TRAP x10
+    cpu.reg.pc = 0x30
+    cpu.reg.cpsr = 0x8002                     # user mode, Z
+    cpu.reg[6] = 0x80                         # user stack
+    cpu.reg.saved_ssp = 0x60
+    cpu.step()
+    assert cpu.reg.pc == 0x20
+    assert cpu.reg.saved_usp == 0x80
+    assert cpu.reg[6] == 0x5E
+    assert cpu.mem.read(0x5E) == 0x31         # return PC
+    assert cpu.mem.read(0x5F) == 0x8002       # old PSR
+    assert not cpu.reg.cpsr & 0x8000
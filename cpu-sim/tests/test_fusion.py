@@ -0,0 +1,110 @@
+from cpu.cpu_core import CPU
+from cpu.engines import PredecodedEngine
+from cpu.runner import load_image
+
+PAIRS = [
+    0x56E0,   # x3000 AND R3, R3, #0
+    0x16F1,   # x3001 ADD R3, R3, #-15    ; load_const
+    0x6440,   # x3002 LDR R2, R1, #0
+    0x1002,   # x3003 ADD R0, R0, R2      ; ldr_add
+    0x127F,   # x3004 ADD R1, R1, #-1
+    0x03FD,   # x3005 BRp #-3             ; add_br, back into the middle of ldr_add
+]
+
+
+def _cpu(program, r1=3):
+    cpu = CPU()
+    load_image(cpu, program, 0x3000)
+    for i in range(4):
+        cpu.mem.write(i, 0x100 * i + 7)
+    cpu.reg[0] = 1
+    cpu.reg[1] = r1
+    return cpu
+
+
+def _reference(program, steps, r1=3):
+    cpu = _cpu(program, r1)
+    cpu.running = True
+    for _ in range(steps):
+        cpu.step()
+    return cpu
+
+
+def _fused(program, steps, r1=3, engine=None):
+    cpu = _cpu(program, r1)
+    cpu.running = True
+    engine = engine or PredecodedEngine(fast_forward=False)
+    n = 0
+    while n < steps:                          # 1..steps 어디서 끊어도 같아야 한다
+        done, err = engine.run(cpu, 1 if n % 3 == 0 else steps - n)
+        assert err is None
+        n += done
+    return cpu, engine
+
+
+def test_all_pairs_fire_and_match_reference():
+    for steps in range(1, 15):
+        ref = _reference(PAIRS, steps)
+        cpu, _ = _fused(PAIRS, steps, engine=PredecodedEngine(fast_forward=False))
+        assert cpu.reg == ref.reg, steps
+    eng = PredecodedEngine(fast_forward=False)
+    cpu = _cpu(PAIRS)
+    cpu.running = True
+    eng.run(cpu, 14)
+    c = eng.counters
+    assert (c["fused_load_const"], c["fused_ldr_add"], c["fused_add_br"]) == (1, 1, 3)
+
+
+def test_jump_into_second_half_of_a_pair():
+    program = [
+        0xE802,   # x3000 LEA R4, #2
+        0xC100,   # x3001 JMP R4              ; skip the AND
+        0x5020,   # x3002 AND R0, R0, #0
+        0x1025,   # x3003 ADD R0, R0, #5
+    ]
+    ref = _reference(program, 3)
+    cpu, eng = _fused(program, 3, engine=PredecodedEngine(fast_forward=False))
+    assert cpu.reg == ref.reg and cpu.reg[0] == 5 + 1
+    assert eng.counters["fused_load_const"] == 0
+
+
+def test_budget_of_one_does_not_run_the_pair():
+    cpu = _cpu(PAIRS)
+    cpu.running = True
+    eng = PredecodedEngine(fast_forward=False)
+    assert eng.run(cpu, 1) == (1, None)
+    assert cpu.reg.pc == 0x3001 and cpu.reg[3] == 0
+    assert eng.counters["fused_load_const"] == 0
+
+
+def test_changed_second_word_falls_back():
+    cpu = _cpu(PAIRS)
+    cpu.running = True
+    eng = PredecodedEngine(fast_forward=False)
+    eng.run(cpu, 2)
+    cpu.reg.pc = 0x3000
+    cpu.mem.write(0x3001, 0x16E1)             # ADD R3,R3,#1 instead of #-15
+    eng.run(cpu, 2)
+    assert cpu.reg[3] == 1
+    assert eng.counters["fused_load_const"] == 1
+
+
+def test_io_page_load_is_not_fused():
+    cpu = _cpu(PAIRS, r1=0xFE04)               # LDR from DSR
+    cpu.running = True
+    eng = PredecodedEngine(fast_forward=False)
+    eng.run(cpu, 4)
+    assert cpu.reg[2] == 0x8000
+    assert eng.counters["fused_ldr_add"] == 0
+
+
+def test_engine_reused_on_another_cpu_drops_old_handlers():
+    eng = PredecodedEngine(fast_forward=False)
+    first = _cpu(PAIRS)
+    first.running = True
+    eng.run(first, 6)
+    other = _cpu([0x1025] * 6)                # ADD R0,R0,#5 at the same addresses
+    other.running = True
+    eng.run(other, 6)
+    assert other.reg[0] == 1 + 6 * 5 and other.reg[3] == 0
+    assert first.reg[3] == 0xFFF1             # 첫 CPU 는 건드리지 않는다
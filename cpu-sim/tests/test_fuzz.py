@@ -0,0 +1,99 @@
+import os
+
+from cpu.engines import PredecodedEngine
+from cpu.fuzz import CHECK_EVERY, Case, ORIGIN, compare, fuzz, minimize, random_case
+from cpu.registers import PC, PSR
+
+# time-boxed job; raise FUZZ_SECONDS / FUZZ_WORKERS for longer soak runs
+FUZZ_SECONDS = float(os.environ.get("FUZZ_SECONDS", "2"))
+FUZZ_WORKERS = int(os.environ.get("FUZZ_WORKERS", "2"))
+
+
+class BrokenAddEngine(PredecodedEngine):
+    """ADD Rd,Rs,#imm forgets to update the condition codes."""
+    name = "broken-add"
+
+    @staticmethod
+    def decode(cpu, instr):
+        if instr >> 12 == 0b0001 and (instr >> 5) & 1:
+            f = cpu.reg.file
+            d, s, imm = (instr >> 9) & 7, (instr >> 6) & 7, instr & 0x1F
+            imm = (imm - 32 if imm & 0x10 else imm) & 0xFFFF
+
+            def h():
+                f[d] = (f[s] + imm) & 0xFFFF
+            return h
+        return PredecodedEngine.decode(cpu, instr)
+
+
+class BrokenStoreEngine(PredecodedEngine):
+    """ST stores its value plus one."""
+    name = "broken-st"
+
+    @staticmethod
+    def decode(cpu, instr):
+        if instr >> 12 == 0b0011:
+            f, m = cpu.reg.file, cpu.mem.mem
+            d, off = (instr >> 9) & 7, instr & 0x1FF
+            off = off - 0x200 if off & 0x100 else off
+
+            def h():
+                m[(f[PC] + off) & 0xFFFF] = (f[d] + 1) & 0xFFFF
+            return h
+        return PredecodedEngine.decode(cpu, instr)
+
+
+def test_cases_are_deterministic():
+    assert repr(random_case(42)) == repr(random_case(42))
+
+
+def test_engines_agree_time_boxed():
+    report = fuzz(FUZZ_SECONDS, workers=FUZZ_WORKERS, seed=1234)
+    assert report.cases > 0 and report.instructions > 0
+    assert report.failures == [], "\n\n".join(report.failures)
+
+
+def test_mismatch_is_minimized():
+    engine = BrokenAddEngine()
+    mismatch = None
+    for seed in range(50):
+        _, mismatch = compare(random_case(seed), [engine])
+        if mismatch:
+            break
+    assert mismatch is not None
+    small = minimize(mismatch, engine)
+    assert "register #10" in small.detail or "steps" in small.detail
+    assert small.case.budget <= mismatch.case.budget
+    assert sum(1 for w in small.case.words if w) <= 4
+
+
+def test_detects_cc_difference_directly():
+    # ADD R0,R0,#1 from PSR with Z set → reference sets P
+    regs = [0] * 8 + [ORIGIN, 0, 0x0002, 0, 0, 0]
+    case = Case(0, ORIGIN, [0x1021], regs, b"", 1)
+    _, mismatch = compare(case, [BrokenAddEngine()])
+    assert mismatch is not None
+    assert mismatch.detail == f"register #{PSR}: 0001 != 0002"
+    assert compare(case)[1] is None
+
+
+def test_divergence_undone_within_the_block_window_is_caught():
+    # ADD (CC 틀림) ; BRnzp #0 ; NOT — NOT 이 CC 를 다시 맞추기 전에 블록 끝에서 잡힌다
+    # (fuse=False: ADD;BR 쌍은 fused handler 가 실행해 고장 난 ADD 를 거치지 않는다)
+    regs = [0] * 8 + [ORIGIN, 0, 0x0002, 0, 0, 0]
+    case = Case(0, ORIGIN, [0x1021, 0x0E00, 0x94BF] + [0] * 20, regs, b"", 20)
+    n, mismatch = compare(case, [BrokenAddEngine(fuse=False)])
+    assert mismatch is not None and mismatch.step == n == 2
+    assert mismatch.detail == f"register #{PSR}: 0001 != 0002"
+
+
+def test_memory_mismatch_is_located_exactly():
+    # 이미 지나간 NOP 에 ST: 메모리만 달라지므로 체크포인트에서 발견되고
+    # 이분 탐색으로 ST 위치를 찾는다
+    at = CHECK_EVERY + 40
+    case = Case(0, ORIGIN, [0] * at + [0x3100], [0] * 8 + [ORIGIN, 0, 2, 0, 0, 0],
+                b"", 2 * CHECK_EVERY)
+    n, mismatch = compare(case, [BrokenStoreEngine()])
+    assert mismatch is not None and n == 2 * CHECK_EVERY
+    assert mismatch.step == at + 1
+    assert mismatch.detail == f"memory x{ORIGIN + at + 1 - 0x100:04X}: 0000 != 0001"
@@ -0,0 +1,88 @@
+from cpu.cpu_core import CPU
+from cpu.engines import PredecodedEngine
+from cpu.idle import FOREVER, taken_run
+from cpu.runner import load_image, run
+
+DELAY = [
+    0x2204,   # x3000 LD  R1, #4      ; R1 = 30000
+    0x127F,   # x3001 ADD R1, R1, #-1
+    0x03FE,   # x3002 BRp #-2
+    0x54A0,   # x3003 AND R2, R2, #0
+    0xB401,   # x3004 STI R2, #1      ; MCR = 0 (halt)
+    30000,
+    0xFFFE,
+]
+WAIT_KEY = [
+    0xA004,   # x3000 LDI R0, #4      ; R0 = KBSR
+    0x07FE,   # x3001 BRzp #-2        ; until READY
+    0xA003,   # x3002 LDI R0, #3      ; R0 = KBDR
+    0x54A0,   # x3003 AND R2, R2, #0
+    0xB402,   # x3004 STI R2, #2      ; MCR = 0 (halt)
+    0xFE00,
+    0xFE02,
+    0xFFFE,
+]
+
+
+def _cpu(program):
+    cpu = CPU()
+    load_image(cpu, program, 0x3000)
+    return cpu
+
+
+def test_taken_run_counts_whole_regions():
+    assert taken_run(5, -1, 0b001) == 4            # 4 3 2 1 | 0
+    assert taken_run(5, -1, 0b011) == 5            # ... 0 | xFFFF
+    assert taken_run(0, -1, 0b100) == 0x8000       # xFFFF .. x8000 | x7FFF
+    assert taken_run(0x7FFE, 1, 0b001) == 1        # x7FFF | x8000
+    assert taken_run(1, 1, 0b000) == 0
+    assert taken_run(0, 1, 0b111) == FOREVER
+
+
+def test_delay_loop_matches_reference():
+    ref = run(_cpu(DELAY), 1_000_000)
+    eng = PredecodedEngine()
+    fast = run(_cpu(DELAY), 1_000_000, engine=eng)
+    assert fast.halted and fast.steps == ref.steps
+    assert fast.cpu.reg == ref.cpu.reg
+    assert fast.stats["idle_loops"] == 1
+    assert fast.stats["idle_skipped"] > 59_000
+
+
+def test_delay_loop_cut_by_budget():
+    for budget in (1001, 1002, 33_333):
+        ref = run(_cpu(DELAY), budget)
+        fast = run(_cpu(DELAY), budget, engine="predecoded")
+        assert fast.steps == ref.steps == budget
+        assert fast.cpu.reg == ref.cpu.reg
+
+
+def test_busy_wait_consumes_budget_without_input():
+    fast = run(_cpu(WAIT_KEY), 10_000_000, engine="predecoded")
+    assert fast.steps == 10_000_000 and not fast.halted
+    assert fast.stats["idle_skipped"] > 9_999_000
+    ref = run(_cpu(WAIT_KEY), 10_001)
+    fast = run(_cpu(WAIT_KEY), 10_001, engine="predecoded")
+    assert fast.cpu.reg == ref.cpu.reg
+
+
+def test_busy_wait_exits_on_input():
+    fast = run(_cpu(WAIT_KEY), 10_000_000, inputs="x", engine="predecoded")
+    assert fast.halted and fast.cpu.reg[0] == ord("x")
+    assert fast.stats["idle_loops"] == 0
+
+
+def test_wait_callback_can_end_the_spin():
+    cpu = _cpu(WAIT_KEY)
+
+    def wait():
+        cpu.keyboard.feed("k")
+        return True
+    eng = PredecodedEngine(idle_wait=wait)
+    result = run(cpu, 10_000_000, engine=eng)
+    assert result.halted and result.steps < 20
+
+
+def test_fast_forward_can_be_disabled():
+    result = run(_cpu(DELAY), 1_000, engine=PredecodedEngine(fast_forward=False))
+    assert result.stats["idle_loops"] == 0 and result.steps == 1_000
@@ -0,0 +1,66 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = (
+    "import sys, time\n"
+    "t = time.perf_counter()\n"
+    "import cpu, cpu.runner\n"
+    "dt = time.perf_counter() - t\n"
+    "heavy = sorted(m for m in ('PySide6', 'inspect', 'typing', 'dataclasses', 'cpu.engines')"
+    " if m in sys.modules)\n"
+    "print(dt, ','.join(heavy))\n"
+)
+
+# generous for slow CI boxes; a clean import takes ~1-3 ms
+IMPORT_BUDGET = 0.02
+
+
+@pytest.fixture(scope="module")
+def pycache_env(tmp_path_factory):
+    """Environment whose bytecode cache is already populated.
+
+    Timing must not depend on a `__pycache__` left behind by earlier runs
+    (or its absence under PYTHONDONTWRITEBYTECODE). A private
+    PYTHONPYCACHEPREFIX is filled by compiling the package and doing one
+    warm-up import, which also caches the stdlib modules it pulls in
+    (the prefix replaces their usual cache too)."""
+    env = dict(os.environ, PYTHONPYCACHEPREFIX=str(tmp_path_factory.mktemp("pycache")))
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    subprocess.run([sys.executable, "-m", "compileall", "-q", "cpu"], cwd=ROOT,
+                   env=env, check=True)
+    _probe(env)
+    return env
+
+
+def _probe(env):
+    out = subprocess.run([sys.executable, "-c", PROBE], cwd=ROOT, env=env,
+                         capture_output=True, text=True, check=True).stdout
+    dt, heavy = out.strip().partition(" ")[::2]
+    return float(dt), heavy
+
+
+def test_cpu_import_has_no_qt_or_heavy_stdlib(pycache_env):
+    _, heavy = _probe(pycache_env)
+    assert heavy == ""
+
+
+def test_cpu_import_time_budget(pycache_env):
+    best = min(_probe(pycache_env)[0] for _ in range(3))
+    assert best < IMPORT_BUDGET, f"import cpu took {best*1000:.1f} ms"
+
+
+def test_main_does_not_import_gui_for_headless(tmp_path):
+    prog = tmp_path / "p.obj"
+    prog.write_bytes(bytes([0x30, 0x00, 0x12, 0x61]))   # .ORIG x3000; ADD R1,R1,#1
+    out = subprocess.run(
+        [sys.executable, "-c",
+         "import sys, main; rc = main.main(['--headless', sys.argv[1], '--steps', '1']);"
+         "print('PySide6' in sys.modules); sys.exit(rc)", str(prog)],
+        cwd=ROOT, capture_output=True, text=True, check=True).stdout
+    assert "R1=0001" in out
+    assert out.strip().endswith("False")
@@ -0,0 +1,85 @@
+from cpu.cpu_core import CPU
+from cpu.devices import KBSR
+from cpu.interrupts import InterruptController, INT_VECTOR_TABLE, KBD_VECTOR
+from cpu.runner import load_image, run
+
+MAIN = [
+    0x2003,   # x3000 LD  R0, #3      ; R0 = x4000 (IE)
+    0xB003,   # x3001 STI R0, #3      ; KBSR = IE
+    0x0FFF,   # x3002 BRnzp #-1       ; idle until interrupted
+    0x0000,
+    0x4000,   # x3004
+    KBSR,     # x3005
+]
+ISR = [
+    0xA202,   # x1000 LDI R1, #2      ; R1 = KBDR
+    0xB202,   # x1001 STI R1, #2      ; DDR = R1
+    0x8000,   # x1002 RTI
+    0xFE02,
+    0xFE06,
+]
+
+
+def _echo_cpu():
+    cpu = CPU()
+    load_image(cpu, ISR, 0x1000)
+    load_image(cpu, MAIN, 0x3000)
+    cpu.mem.write(INT_VECTOR_TABLE + KBD_VECTOR, 0x1000)
+    cpu.reg[6] = 0x2FFF
+    return cpu
+
+
+def test_controller_picks_highest_priority_above_level():
+    intc = InterruptController()
+    assert not intc.pending
+    intc.request(0x80, 4)
+    intc.request(0x90, 6)
+    assert intc.pending
+    assert intc.highest(0) == (0x90, 6)
+    assert intc.highest(6) is None
+    intc.withdraw(0x90)
+    intc.withdraw(0x80)
+    assert not intc.pending
+
+
+def test_interrupt_driven_echo():
+    cpu = _echo_cpu()
+    result = run(cpu, 200, inputs="hi")
+    assert result.output == "hi"
+    assert not cpu.intc.pending
+    assert cpu.reg.pc in (0x3002, 0x3003)
+    assert cpu.reg[6] == 0x2FFF               # stack balanced after RTIs
+
+
+def test_interrupt_masked_by_priority():
+    cpu = _echo_cpu()
+    cpu.reg.cpsr = 4 << 8                     # running at PL4
+    result = run(cpu, 50, inputs="x")
+    assert result.output == ""
+    assert cpu.intc.pending                   # request stays asserted
+
+
+def test_interrupt_from_user_mode_switches_stack():
+    cpu = _echo_cpu()
+    cpu.keyboard.feed("z")
+    cpu.keyboard.write_status(0x4000)
+    cpu.reg.pc = 0x3002
+    cpu.reg.cpsr = 0x8001                     # user mode, PL0, P
+    cpu.reg[6] = 0x5000                       # user stack
+    cpu.step()                                # enters ISR, executes LDI
+    assert cpu.reg.saved_usp == 0x5000
+    assert cpu.reg[6] == 0x3000 - 2
+    assert cpu.reg.cpsr & 0x8700 == 0x0400    # supervisor, PL4
+    assert cpu.reg[1] == ord("z")
+    run(cpu, 2)                               # STI, RTI
+    assert cpu.reg.pc == 0x3002
+    assert cpu.reg[6] == 0x5000
+    assert cpu.reg.cpsr == 0x8001
+
+
+def test_mcr_clear_halts_run():
+    cpu = CPU()
+    load_image(cpu, [0x5020, 0xB000, 0xFFFE], 0x3000)   # AND R0,R0,#0 ; STI R0 → MCR
+    result = run(cpu, 1000)
+    assert result.halted
+    assert result.steps == 2
@@ -0,0 +1,49 @@
+from cpu.memory import Memory
+
+
+def _mem():
+    mem = Memory()
+    for addr, word in ((0x3000, 0x1234), (0x3001, 0xABCD), (0x8000, 0x1234), (0xFFFF, 0x00AA)):
+        mem.write(addr, word)
+    return mem
+
+
+def test_find_words_wraps_from_start():
+    mem = _mem()
+    assert mem.find(0x1234) == 0x3000
+    assert mem.find(0x1234, 0x3001) == 0x8000
+    assert mem.find(0x1234, 0x8001) == 0x3000          # wraps around
+    assert mem.find([0x1234, 0xABCD]) == 0x3000
+    assert mem.find([0x1234, 0xABCD], 0x3001) == 0x3000
+    assert mem.find(0x4321) is None
+    assert mem.find([]) is None
+
+
+def test_find_words_only_on_word_boundaries():
+    mem = _mem()
+    assert mem.find(0xCD12) is None                    # bytes 34 [12 CD] AB: unaligned
+    mem.write(0x0000, 0x5555)
+    assert mem.find([0x00AA, 0x5555], 0x9000) == 0xFFFF  # pattern across the wrap
+
+
+def test_find_bytes_in_low_byte_first_order():
+    mem = _mem()
+    assert mem.find(b"\x12\xCD") == 0x3000             # x3000 high, x3001 low
+    assert mem.find(b"\xCD\xAB") == 0x3001
+    assert mem.find(b"\xAA") == 0xFFFF
+
+
+def test_peek_has_no_device_side_effects():
+    from cpu.cpu_core import CPU
+    from cpu.devices import KBDR, KBSR, MCR
+    cpu = CPU()
+    cpu.keyboard.feed("ab")
+    for _ in range(3):
+        assert cpu.mem.peek(KBSR) == 0x8000
+        assert cpu.mem.peek(KBDR) == ord("a")
+    assert cpu.mem.peek(MCR) == 0x8000
+    assert cpu.keyboard.ready and cpu.keyboard.buffer == b"b"
+    assert cpu.mem.read(KBDR) == ord("a")           # read() still acknowledges
+    assert cpu.mem.peek(KBDR) == ord("b")
+    cpu.mem.mem[0xFE10] = 0x1234                     # unmapped I/O word: backing RAM
+    assert cpu.mem.peek(0xFE10) == 0x1234
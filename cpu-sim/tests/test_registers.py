@@ -0,0 +1,52 @@
+import pytest
+
+from cpu.registers import Registers, GENERAL_REGS, REG_COUNT, PC, PSR, SSP, USP
+
+
+def test_gpr_masks_to_16_bits():
+    reg = Registers()
+    reg[3] = 0x12345
+    assert reg[3] == 0x2345
+    reg[0] = -1
+    assert reg[0] == 0xFFFF
+
+
+def test_gpr_bounds_checked():
+    reg = Registers()
+    with pytest.raises(IndexError):
+        reg[GENERAL_REGS]
+    with pytest.raises(IndexError):
+        reg[-1] = 0
+
+
+def test_special_registers_share_flat_file():
+    reg = Registers()
+    reg.pc = 0x13000
+    reg.cpsr = 0x8002
+    reg.saved_ssp = 0x3000
+    reg.saved_usp = 0xFE00
+    reg.lr = 0x1234
+    assert reg.pc == 0x3000
+    f = reg.file
+    assert (f[PC], f[PSR], f[SSP], f[USP]) == (0x3000, 0x8002, 0x3000, 0xFE00)
+
+
+def test_snapshot_roundtrip():
+    a = Registers()
+    for i in range(GENERAL_REGS):
+        a[i] = i * 0x1111
+    a.pc, a.ir, a.cpsr = 0x3000, 0x1261, 0x8001
+    snap = a.as_tuple()
+    assert len(snap) == REG_COUNT
+
+    b = Registers()
+    b.load(snap)
+    assert b == a
+    assert b.gpr == [i * 0x1111 for i in range(GENERAL_REGS)]
+    with pytest.raises(ValueError):
+        b.load(snap[:-1])
+
+
+def test_slotted():
+    with pytest.raises(AttributeError):
+        Registers().bogus = 1
@@ -0,0 +1,137 @@
+import struct
+
+import pytest
+
+from cpu.cpu_core import CPU
+from cpu.runner import load_image, run
+from cpu.savestate import FLAG_SPARSE, FLAG_ZLIB
+
+# echo characters until the input runs dry, counting in R3
+ECHO = [
+    0xA005,   # x3000 LDI R0, #5      ; R0 = KBSR
+    0x07FE,   # x3001 BRzp #-2
+    0xA204,   # x3002 LDI R1, #4      ; R1 = KBDR
+    0xB204,   # x3003 STI R1, #4      ; DDR = R1
+    0x16E1,   # x3004 ADD R3, R3, #1
+    0x0FFA,   # x3005 BRnzp #-6
+    0xFE00,
+    0xFE02,
+    0xFE06,
+]
+
+
+def _cpu():
+    cpu = CPU()
+    load_image(cpu, ECHO, 0x3000)
+    cpu.mem.write(0x9000, 0xBEEF)
+    cpu.reg.saved_usp = 0x1234
+    return cpu
+
+
+def _same(a, b):
+    assert a.reg == b.reg
+    assert a.mem.mem == b.mem.mem
+    assert a.running == b.running
+    assert (a.keyboard.buffer, a.keyboard.data, a.display.output) == \
+           (b.keyboard.buffer, b.keyboard.data, b.display.output)
+
+
+@pytest.mark.parametrize("compress", [True, False])
+@pytest.mark.parametrize("sparse", [True, False, None])
+def test_roundtrip(tmp_path, compress, sparse):
+    cpu = _cpu()
+    run(cpu, 20, inputs="hello")
+    path = tmp_path / "s.lc3s"
+    size = cpu.save_state(path, compress=compress, sparse=sparse)
+    assert size == path.stat().st_size
+    flags = struct.unpack_from("<4sHH", path.read_bytes())[2]
+    assert bool(flags & FLAG_ZLIB) == compress
+    assert bool(flags & FLAG_SPARSE) == (sparse is not False)
+    other = CPU()
+    other.mem.write(0x5000, 1)                  # 복원 시 지워져야 한다
+    other.load_state(path)
+    _same(cpu, other)
+    if not compress and sparse is not False:
+        assert size < 3 * 512 + 200             # pages x30, x90 and the device page
+
+
+def test_failed_save_keeps_previous_checkpoint(tmp_path, monkeypatch):
+    path = tmp_path / "s.lc3s"
+    cpu = _cpu()
+    cpu.save_state(path)
+    good = path.read_bytes()
+
+    def crash(src, dst):
+        raise OSError("killed")
+    monkeypatch.setattr("os.replace", crash)
+    run(cpu, 20)
+    with pytest.raises(OSError):
+        cpu.save_state(path)
+    assert path.read_bytes() == good
+    assert [p.name for p in tmp_path.iterdir()] == ["s.lc3s"]
+
+
+def test_resume_matches_uninterrupted_run(tmp_path):
+    full = _cpu()
+    run(full, 200, inputs="resume")
+    part = _cpu()
+    first = run(part, 77, inputs="resume")
+    part.save_state(tmp_path / "mid.lc3s")
+    resumed = CPU()
+    resumed.load_state(tmp_path / "mid.lc3s")
+    rest = run(resumed, 200 - first.steps, engine="predecoded")
+    _same(full, resumed)
+    assert rest.output == "resume" and resumed.reg[3] == 6
+
+
+def test_rejects_corrupt_or_foreign_files(tmp_path):
+    cpu = _cpu()
+    path = tmp_path / "s.lc3s"
+    cpu.save_state(path)
+    data = bytearray(path.read_bytes())
+    data[-1] ^= 0xFF
+    path.write_bytes(bytes(data))
+    other = _cpu()
+    other.reg.pc = 0x4000
+    with pytest.raises(ValueError, match="checksum"):
+        other.load_state(path)
+    assert other.reg.pc == 0x4000               # 실패 시 상태는 그대로
+    path.write_bytes(b"LC3X" + bytes(data[4:]))
+    with pytest.raises(ValueError, match="magic"):
+        other.load_state(path)
+    path.write_bytes(bytes(data[:4]) + struct.pack("<H", 99) + bytes(data[6:]))
+    with pytest.raises(ValueError, match="version 99"):
+        other.load_state(path)
+
+
+def _forge(path, body, flags=FLAG_ZLIB):
+    """Write `body` behind a header with a valid CRC."""
+    import zlib
+    path.write_bytes(struct.pack("<4sHHII", b"LC3S", 1, flags, len(body), zlib.crc32(body))
+                     + body)
+
+
+def test_rejects_bad_contents_behind_a_valid_checksum(tmp_path):
+    import json
+    from cpu.registers import REG_COUNT
+    path = tmp_path / "s.lc3s"
+    cpu = _cpu()
+    before = (cpu.reg.as_tuple(), bytes(cpu.mem.mem))
+
+    _forge(path, b"this is not a zlib stream")
+    with pytest.raises(ValueError, match="malformed"):
+        cpu.load_state(path)
+
+    regs = struct.pack(f"<{REG_COUNT}H", *range(REG_COUNT))
+    for meta in ({"running": True}, {"devices": []}, {"running": True, "devices": [1, 2]},
+                 {"running": True, "devices": ["zz", 0, 0, 0, "", 0, 0, []]},
+                 {"running": True, "devices": [5, 0, 0, 0, "", 0, 0, []]},
+                 {"running": True, "devices": ["", 0, 0, 0, "", 0, 0, [[0x80, 9]]]},
+                 {"running": True, "devices": ["", 0, 0, 0, "", 0, 0, [[0x100, 4]]]},
+                 {"running": True, "devices": ["", 0x10000, 0, 0, "", 0, 0, []]},
+                 {"running": True, "devices": ["", 0, 0, 0, "", 0, -1, []]}):
+        raw = json.dumps(meta).encode()
+        _forge(path, regs + struct.pack("<I", len(raw)) + raw + bytes(2 * 0x10000), flags=0)
+        with pytest.raises(ValueError, match="malformed"):
+            cpu.load_state(path)
+    assert (cpu.reg.as_tuple(), bytes(cpu.mem.mem)) == before
@@ -0,0 +1,81 @@
+import asyncio
+import json
+
+import pytest
+
+from cpu.service import JobService, failed_result, validate
+
+ECHO_HALT = [0xA004, 0xB004, 0x5260, 0xB203, 0x0000, 0xFE02, 0xFE06, 0xFFFE]
+# LD R0,#0 sets CC=P so BRnzp #-1 spins until the budget runs out
+# (on the reference engine; the predecoded engine would fast-forward it)
+SPIN = [0x2000, 0x0FFF]
+
+
+async def _http(addr, method, path, payload=None):
+    reader, writer = await asyncio.open_connection(*addr)
+    body = json.dumps(payload).encode() if payload is not None else b""
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: x\r\n"
+                 f"Content-Length: {len(body)}\r\n\r\n".encode() + body)
+    await writer.drain()
+    raw = await reader.read()
+    writer.close()
+    head, _, rest = raw.partition(b"\r\n\r\n")
+    status = int(head.split()[1])
+    return status, [json.loads(line) for line in rest.splitlines() if line.strip()]
+
+
+def test_job_roundtrip_and_stats():
+    async def main():
+        async with JobService(workers=1, queue_size=4) as svc:
+            addr = await svc.start()
+            status, events = await _http(addr, "POST", "/jobs", {
+                "origin": 0x3000, "words": ECHO_HALT, "inputs": "k", "budget": 100})
+            assert status == 200
+            assert [e["event"] for e in events] == ["queued", "started", "result"]
+            result = events[-1]
+            assert result["output"] == "k" and result["halted"] and result["steps"] == 4
+            assert set(result) == {"event", "id"} | set(failed_result("x"))
+
+            status, (stats,) = await _http(addr, "GET", "/stats")
+            assert status == 200
+            assert stats["completed"] == 1 and stats["queue_depth"] == 0
+            assert stats["latency"]["p50"] > 0
+
+            status, (err,) = await _http(addr, "POST", "/jobs", {"words": [1], "budget": -1})
+            assert status == 400 and "budget" in err["error"]
+    asyncio.run(main())
+
+
+def test_backpressure_and_progress():
+    async def main():
+        svc = JobService(workers=1, queue_size=1, submit_timeout=0.05, progress_every=50_000)
+        async with svc:
+            addr = await svc.start()
+            spin = {"origin": 0x3000, "words": SPIN, "budget": 400_000, "engine": "reference"}
+            first = asyncio.create_task(_http(addr, "POST", "/jobs", spin))
+            await asyncio.sleep(0.05)                 # running
+            second = asyncio.create_task(_http(addr, "POST", "/jobs", spin))
+            await asyncio.sleep(0.05)                 # queued: the queue is now full
+            status, _ = await _http(addr, "POST", "/jobs", spin)
+            assert status == 503
+            (s1, ev1), (s2, ev2) = await asyncio.gather(first, second)
+            assert s1 == s2 == 200
+            assert any(e["event"] == "progress" for e in ev1)
+            assert ev1[-1]["steps"] == ev2[-1]["steps"] == 400_000
+            stats = svc.stats()
+            assert (stats["completed"], stats["rejected"]) == (2, 1)
+    asyncio.run(main())
+
+
+@pytest.mark.parametrize("spec, field", [
+    ({"words": [1], "budget": True}, "budget"),
+    ({"words": [1], "budget": 10, "origin": False}, "origin"),
+    ({"words": [True], "budget": 10}, "words"),
+    ({"words": [1], "budget": 10, "inputs": "\u20ac"}, "inputs"),
+    ({"words": [0] * 0x10001, "budget": 10, "origin": 0}, "words"),
+    ({"words": [0, 0], "budget": 10, "origin": 0xFFFF}, "words"),
+])
+def test_validate_rejects_at_submit_time(spec, field):
+    with pytest.raises(ValueError, match=field):
+        validate(spec)
+    assert validate({"words": [0] * 0x10000, "budget": 1, "origin": 0, "inputs": "\xe9"})
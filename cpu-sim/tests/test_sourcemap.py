@@ -0,0 +1,42 @@
+from cpu.assembler import assemble
+from cpu.cpu_core import CPU
+from cpu.runner import load_image, run
+from cpu.sourcemap import SourceMap
+
+# NOT turns the x2FFF at CODE into xD000 (reserved opcode) and stores it at SLOT
+SOURCE = ("        LD  R1, CODE\n"
+          "        NOT R1, R1\n"
+          "        ST  R1, SLOT\n"
+          "\n"
+          "SLOT    ADD R0, R0, #0\n"
+          "CODE    LD  R7, #-1\n")
+
+
+def test_lookups_in_both_directions():
+    smap = SourceMap([(7, 0x3002), (2, 0x3000), (5, 0x3001), (5, 0x4000)], "a.asm")
+    assert list(smap.addrs) == [0x3000, 0x3001, 0x3002, 0x4000]
+    assert smap.line_for(0x3001) == 5 and smap.line_for(0x4000) == 5
+    assert smap.line_for(0x2FFF) is None and smap.line_for(0x3003) is None
+    assert smap.addresses_for(5) == [0x3001, 0x4000]
+    assert smap.addresses_for(6) == []
+    assert smap.location(0x3002) == "a.asm:7"
+    assert len(SourceMap([])) == 0 and SourceMap([]).line_for(0) is None
+
+
+def test_assembly_produces_source_map():
+    asm = assemble(SOURCE, 0x3000, "prog.asm")
+    assert asm.source_map.line_for(0x3003) == 5
+    assert asm.source_map.addresses_for(6) == [0x3004]
+    assert asm.source_map.addresses_for(4) == []
+
+
+def test_runtime_error_reports_file_and_line():
+    for engine in ("reference", "predecoded"):
+        asm = assemble(SOURCE, 0x3000, "prog.asm")
+        cpu = CPU()
+        load_image(cpu, asm.words, 0x3000)
+        cpu.source_map = asm.source_map
+        result = run(cpu, 100, engine=engine)
+        assert result.error == "Illegal-opcode exception (1101)"
+        assert result.location == "prog.asm:5"
+    assert run(CPU(), 10).location is None